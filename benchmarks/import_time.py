@@ -0,0 +1,101 @@
+# benchmarks/import_time.py
+"""Measure how long DABHounds takes to start.
+
+Times simple commands end to end in fresh interpreters and lists the
+slowest modules `import dabhounds.cli` pulls in (python -X importtime).
+With --budget-ms the script exits non-zero when a command's median is
+over budget, so an import-time regression fails loudly.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --budget-ms 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = {
+    "import": ["-c", "import dabhounds.cli"],
+    "--credits": ["-m", "dabhounds.cli", "--credits"],
+    "--help": ["-m", "dabhounds.cli", "--help"],
+}
+# Must never be imported just to start the CLI
+HEAVY_MODULES = ("yt_dlp", "spotipy", "musicbrainzngs", "rapidfuzz", "requests", "aiohttp")
+
+
+def _env(home: str) -> dict:
+    # A throwaway HOME keeps the user's config out of the measurement
+    env = dict(os.environ, HOME=home)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def time_command(args, runs: int, env: dict) -> list:
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def import_profile(code: str, env: dict) -> dict:
+    """{module: cumulative µs} for every module imported while running ``code``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            env=env, check=True, capture_output=True, text=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure DABHounds startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (default: 10)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default: 15)")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any command's median exceeds this")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        env = _env(home)
+        # First run creates the config; keep it out of the timings
+        subprocess.run([sys.executable, *COMMANDS["--credits"]], env=env, check=True, stdout=subprocess.DEVNULL)
+
+        baseline = statistics.median(time_command(["-c", "pass"], args.runs, env))
+        print(f"{'command':<12} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+        print(f"{'(python)':<12} {baseline:>10.1f}")
+        for name, cmd in COMMANDS.items():
+            timings = time_command(cmd, args.runs, env)
+            median = statistics.median(timings)
+            over = args.budget_ms is not None and median > args.budget_ms
+            failed = failed or over
+            print(f"{name:<12} {median:>10.1f} {min(timings):>8.1f} {max(timings):>8.1f}{'  OVER BUDGET' if over else ''}")
+
+        # Leave out what the bare interpreter (site, .pth hooks) imports anyway
+        interpreter = import_profile("pass", env)
+        modules = {name: us for name, us in import_profile("import dabhounds.cli", env).items()
+                   if name not in interpreter}
+
+    print("\nSlowest imports under dabhounds.cli (cumulative):")
+    for name, cumulative_us in sorted(modules.items(), key=lambda m: m[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    if heavy:
+        print(f"\nHeavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# benchmarks/load.py
+"""End-to-end conversion benchmark against local stand-in services.
+
+Starts the stand-ins from mock_services.py, then runs one real conversion
+(cli.main() on a synthetic Spotify playlist) per playlist size, each in a
+fresh interpreter with a throwaway HOME so no cache, match store or
+catalog index carries over. Reports wall time, tracks/sec and the
+requests each service received, plus the run's own --metrics breakdown
+(in the --json output).
+
+DAB's and MusicBrainz's shipped rate limits would make the run measure the
+limiter alone, so they are raised (see --dab-rate / --mb-rate) unless
+--real-limits is given.
+
+    python benchmarks/load.py                                  # 100, 1000, 10000 tracks
+    python benchmarks/load.py --tracks 50000 --workers 8
+    python benchmarks/load.py --tracks 1000 --latency dab=80,spotify=120 --rate-limit dab=20
+    python benchmarks/load.py --tracks 1000 --engine async --json results.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_services import (  # noqa: E402
+    PLAYLIST_ID, SERVICES, Behaviour, MockServices, SyntheticCatalog, parse_service_values,
+)
+
+DEFAULT_SIZES = "100,1000,10000"
+
+
+# --- child: one conversion, run inside a fresh interpreter ---
+
+def _point_at(base_url: str, host: str, args):
+    """Send every DABHounds client to the stand-ins and apply the benchmark limits."""
+    from dabhounds.core import auth
+    auth.MASTER_CONFIG["DAB_API_BASE"] = f"{base_url}/dab/api"
+    auth.save_config(dict(
+        auth.load_config(),
+        DAB_AUTH_TOKEN="bench",
+        SHOW_TUI_OUTPUT=False,
+        CACHE_ENABLED=not args.no_cache,
+    ))
+
+    import spotipy
+    import spotipy.oauth2
+
+    class BenchSpotify(spotipy.Spotify):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.prefix = f"{base_url}/spotify/v1/"
+
+    spotipy.Spotify = BenchSpotify
+    spotipy.oauth2.SpotifyClientCredentials.OAUTH_TOKEN_URL = f"{base_url}/spotify/api/token"
+
+    import musicbrainzngs
+    musicbrainzngs.set_hostname(host, use_https=False)
+
+    from dabhounds.core import musicbrainz, qobuz, ratelimit
+    qobuz.QOBUZ_API = f"{base_url}/qobuz/api.json/0.2/track/search"
+    if not args.real_limits:
+        ratelimit.DAB_LIMITER.rate = ratelimit.DAB_LIMITER.max_rate = args.dab_rate
+        musicbrainz.MB_LIMITER.rate = args.mb_rate
+
+
+def run_child(args):
+    _point_at(args.base_url, args.host, args)
+    from dabhounds import cli
+
+    argv = ["dabhounds", f"https://open.spotify.com/playlist/{PLAYLIST_ID}", "--mode", args.mode]
+    if args.workers:
+        argv += ["--workers", str(args.workers)]
+    if args.engine:
+        argv += ["--engine", args.engine]
+    argv += ["--metrics", str(Path(args.result).with_name("metrics.json"))]
+    sys.argv = argv
+
+    code = 0
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            cli.main()
+        except SystemExit as e:
+            code = e.code or 0
+        finally:
+            sys.stdout = stdout
+    wall = time.perf_counter() - started
+
+    import resource
+    Path(args.result).write_text(json.dumps({
+        "wall_s": wall,
+        "exit_code": code,
+        # KiB on Linux
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+# --- parent: stand-ins, one child per size, summary ---
+
+def run_size(services: MockServices, tracks: int, args) -> dict:
+    services.catalog.tracks = tracks
+    services.reset_stats()
+    with tempfile.TemporaryDirectory() as home:
+        result_file = Path(home) / "result.json"
+        cmd = [
+            sys.executable, __file__, "--child",
+            "--base-url", services.base_url, "--host", services.host,
+            "--result", str(result_file), "--mode", args.mode,
+            "--dab-rate", str(args.dab_rate), "--mb-rate", str(args.mb_rate),
+        ]
+        if args.workers:
+            cmd += ["--workers", str(args.workers)]
+        if args.engine:
+            cmd += ["--engine", args.engine]
+        if args.real_limits:
+            cmd.append("--real-limits")
+        if args.no_cache:
+            cmd.append("--no-cache")
+        env = dict(os.environ, HOME=home)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path(__file__).resolve().parents[1]),
+                                                          env.get("PYTHONPATH")]))
+        try:
+            proc = subprocess.run(cmd, env=env, cwd=home, capture_output=True, text=True, timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Benchmark run for {tracks} tracks did not finish within {args.timeout}s")
+        if proc.returncode or not result_file.exists():
+            raise RuntimeError(f"Benchmark run for {tracks} tracks failed:\n{proc.stderr[-2000:]}")
+        result = json.loads(result_file.read_text())
+        metrics_file = result_file.with_name("metrics.json")
+        if metrics_file.exists():
+            result["metrics"] = json.loads(metrics_file.read_text())
+
+    stats = services.stats()
+    result.update(
+        tracks=tracks,
+        tracks_per_s=tracks / result["wall_s"] if result["wall_s"] else 0,
+        requests={service: stats.get(service, {}).get("requests", 0) for service in SERVICES},
+        throttled=sum(by.get("429", 0) for s in stats.values() for by in s["by_endpoint"].values()),
+        library_adds=sum(stats.get("dab", {}).get("by_endpoint", {}).get("/libraries/<id>/tracks", {}).values()),
+        services=stats,
+    )
+    return result
+
+
+def print_summary(results):
+    header = (f"{'tracks':>7} {'wall s':>8} {'tracks/s':>9} {'exit':>4} "
+              + " ".join(f"{s:>11}" for s in SERVICES) + f" {'429s':>6} {'adds':>6} {'rss MB':>7}")
+    print(header)
+    for r in results:
+        print(f"{r['tracks']:>7} {r['wall_s']:>8.2f} {r['tracks_per_s']:>9.1f} {r['exit_code']:>4} "
+              + " ".join(f"{r['requests'][s]:>11}" for s in SERVICES)
+              + f" {r['throttled']:>6} {r['library_adds']:>6} {r['max_rss_mb']:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end DABHounds benchmark against local stand-ins")
+    parser.add_argument("--tracks", default=DEFAULT_SIZES, help=f"Comma-separated playlist sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--mode", choices=["strict", "lenient"], default="lenient")
+    parser.add_argument("--workers", type=int, help="Passed to dabhounds --workers")
+    parser.add_argument("--engine", choices=["sync", "async"], help="Passed to dabhounds --engine")
+    parser.add_argument("--latency", help='Per-service latency in ms, e.g. "dab=50,spotify=80" or "30"')
+    parser.add_argument("--errors", help='Per-service share of HTTP 500 responses, e.g. "qobuz=0.02"')
+    parser.add_argument("--rate-limit", help='Per-service quota in requests/s; excess gets 429, e.g. "dab=20"')
+    parser.add_argument("--throttle", help='Per-service share of random HTTP 429 responses, e.g. "dab=0.01"')
+    parser.add_argument("--retry-after", help='Per-service Retry-After seconds sent with 429s (default: 1)')
+    parser.add_argument("--isrc-hit-rate", type=float, default=0.8, help="Share of tracks DAB finds by ISRC")
+    parser.add_argument("--absent-rate", type=float, default=0.05, help="Share of tracks missing from DAB")
+    parser.add_argument("--dab-rate", type=float, default=1000.0, help="DAB requests/s allowed (default: 1000)")
+    parser.add_argument("--mb-rate", type=float, default=1000.0, help="MusicBrainz requests/s allowed (default: 1000)")
+    parser.add_argument("--real-limits", action="store_true", help="Keep the shipped DAB/MusicBrainz rate limits")
+    parser.add_argument("--no-cache", action="store_true", help="Run with the lookup cache disabled")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds allowed per conversion (default: 3600)")
+    parser.add_argument("--json", help="Also write the full results (per-endpoint counts) here")
+    # Internal: run one conversion against already-running stand-ins
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--host", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    latency = parse_service_values(args.latency)
+    errors = parse_service_values(args.errors)
+    throttle = parse_service_values(args.throttle)
+    retry_after = parse_service_values(args.retry_after, cast=int)
+    rate_limit = parse_service_values(args.rate_limit)
+    behaviour = {
+        s: Behaviour(latency.get(s, 0), errors.get(s, 0), throttle.get(s, 0), retry_after.get(s, 1),
+                     rate_limit.get(s, 0))
+        for s in SERVICES
+    }
+    catalog = SyntheticCatalog(0, isrc_hit_rate=args.isrc_hit_rate, absent_rate=args.absent_rate)
+    services = MockServices(catalog, behaviour).start()
+
+    results = []
+    try:
+        for size in (int(n) for n in args.tracks.split(",") if n.strip()):
+            print(f"Converting {size} tracks...", file=sys.stderr)
+            results.append(run_size(services, size, args))
+    finally:
+        services.stop()
+
+    print_summary(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "settings": {k: v for k, v in vars(args).items() if k not in ("child", "base_url", "host", "result", "json")},
+            "behaviour": {s: b.as_dict() for s, b in behaviour.items()},
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
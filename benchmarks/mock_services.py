@@ -0,0 +1,392 @@
+# benchmarks/mock_services.py
+"""Local stand-ins for every service a conversion talks to.
+
+One threaded HTTP server answers, by path prefix:
+
+    /dab/api/...          DAB: /auth/me, /search, /libraries, /libraries/<id>[/tracks]
+    /spotify/api/token    Spotify client-credentials token
+    /spotify/v1/...       Spotify: playlists/<id>, playlists/<id>/items, tracks
+    /qobuz/api.json/...   Qobuz track search (ISRC -> IDs)
+    /ws/2/...             MusicBrainz XML web service (isrc/<isrc>, recording)
+
+The world is synthetic and deterministic: playlist track ``i`` is
+"Artist <i % 997> - Song <i>" with ISRC BENCH<i:07d>. DAB finds a
+configurable share of tracks by ISRC; the rest are found by a text search
+(after a MusicBrainz ISRC lookup) unless they are absent altogether.
+
+Each service has its own latency, error rate (HTTP 500), quota and random
+throttle rate (both HTTP 429 with Retry-After), and every request is
+counted per endpoint.
+Run this file to serve the stand-ins on their own, e.g. for manual runs.
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SERVICES = ("dab", "spotify", "qobuz", "musicbrainz")
+PLAYLIST_ID = "benchplaylist"
+LIBRARY_ID = "benchlibrary"
+ARTISTS = 997
+# DAB text searches answer with the wanted track plus this many neighbours,
+# so fuzzy scoring has real candidates to rank
+SEARCH_DECOYS = 9
+
+_ISRC_RE = re.compile(r"^BENCH(\d{7})$")
+_SONG_RE = re.compile(r"Song (\d+)")
+_MB_NS = 'xmlns="http://musicbrainz.org/ns/mmd-2.0#" xmlns:ns2="http://musicbrainz.org/ns/ext#-2.0"'
+
+
+class Behaviour:
+    """How one stand-in service responds.
+
+    ``rate_limit`` (requests/s, 0 = unlimited) answers anything over the
+    rate with 429, the way DAB enforces its quota. ``throttle_rate`` sends
+    429s at random regardless of load, which drives an adaptive client down
+    to its minimum rate, so keep it small.
+    """
+
+    def __init__(self, latency_ms: float = 0, error_rate: float = 0,
+                 throttle_rate: float = 0, retry_after: int = 1, rate_limit: float = 0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self._tokens = float(rate_limit)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def over_limit(self) -> bool:
+        """Spend one request from the quota; True if there was none left."""
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def as_dict(self) -> Dict:
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+
+def parse_service_values(text: Optional[str], cast=float) -> Dict[str, float]:
+    """Parse "dab=50,spotify=80" (or a bare "50" for every service)."""
+    if not text:
+        return {}
+    if "=" not in text:
+        return {service: cast(text) for service in SERVICES}
+    values = {}
+    for part in text.split(","):
+        service, _, value = part.partition("=")
+        if service.strip() not in SERVICES:
+            raise ValueError(f"Unknown service '{service}' (expected one of {', '.join(SERVICES)})")
+        values[service.strip()] = cast(value)
+    return values
+
+
+class SyntheticCatalog:
+    """The playlist, DAB catalog and MusicBrainz data the stand-ins serve."""
+
+    def __init__(self, tracks: int, isrc_hit_rate: float = 0.8, absent_rate: float = 0.05):
+        self.tracks = tracks
+        self.isrc_hit_rate = isrc_hit_rate
+        self.absent_rate = absent_rate
+
+    @staticmethod
+    def _fraction(i: int, salt: int) -> float:
+        # Deterministic per-track coin flip, stable across runs
+        return ((i * 2654435761 + salt * 40503) % 10007) / 10007
+
+    def in_dab(self, i: int) -> bool:
+        return 0 <= i < self.tracks and self._fraction(i, 1) >= self.absent_rate
+
+    def isrc_indexed(self, i: int) -> bool:
+        return self.in_dab(i) and self._fraction(i, 2) < self.isrc_hit_rate
+
+    @staticmethod
+    def isrc(i: int) -> str:
+        return f"BENCH{i:07d}"
+
+    @staticmethod
+    def title(i: int) -> str:
+        return f"Song {i}"
+
+    @staticmethod
+    def artist(i: int) -> str:
+        return f"Artist {i % ARTISTS}"
+
+    @staticmethod
+    def duration_ms(i: int) -> int:
+        return 150000 + (i * 7919) % 150000
+
+    def spotify_track(self, i: int) -> Dict:
+        return {
+            "id": f"bench{i:07d}",
+            "name": self.title(i),
+            "duration_ms": self.duration_ms(i),
+            "artists": [{"name": self.artist(i)}],
+            "external_ids": {"isrc": self.isrc(i)},
+            "external_urls": {"spotify": f"https://open.spotify.com/track/bench{i:07d}"},
+        }
+
+    def dab_track(self, i: int) -> Dict:
+        return {
+            "id": i + 1,
+            "title": self.title(i),
+            "artist": self.artist(i),
+            "artistId": i % ARTISTS + 1,
+            "albumTitle": f"Album {i // 12}",
+            "albumId": f"album{i // 12}",
+            "albumCover": "",
+            "releaseDate": "2020-01-01",
+            "genre": "Benchmark",
+            "isrc": self.isrc(i),
+            "duration": self.duration_ms(i) // 1000,
+            "audioQuality": {"maximumBitDepth": 24, "maximumSampleRate": 96, "isHiRes": True},
+        }
+
+    def mb_recording(self, i: int) -> str:
+        return (
+            f'<recording id="00000000-0000-0000-0000-{i:012d}">'
+            f"<title>{self.title(i)}</title><length>{self.duration_ms(i)}</length>"
+            f'<artist-credit><name-credit><artist id="00000000-0000-0000-0001-{i % ARTISTS:012d}">'
+            f"<name>{self.artist(i)}</name><sort-name>{self.artist(i)}</sort-name></artist>"
+            f"</name-credit></artist-credit>"
+            f'<isrc-list count="1"><isrc id="{self.isrc(i)}"/></isrc-list></recording>'
+        )
+
+
+class MockServices:
+    """The stand-in server: start() it, point DABHounds at base_url, read stats()."""
+
+    def __init__(self, catalog: SyntheticCatalog, behaviour: Optional[Dict[str, Behaviour]] = None,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.catalog = catalog
+        self.behaviour = {service: Behaviour() for service in SERVICES}
+        self.behaviour.update(behaviour or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: defaultdict(int))
+        self._latency = defaultdict(float)
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def host(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "MockServices":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts.clear()
+            self._latency.clear()
+
+    def stats(self) -> Dict:
+        """{service: {"requests", "by_endpoint": {endpoint: {status: count}}, "latency_s"}}."""
+        with self._lock:
+            out = {}
+            for (service, endpoint), statuses in sorted(self._counts.items()):
+                entry = out.setdefault(service, {"requests": 0, "by_endpoint": {}, "latency_s": 0.0})
+                entry["requests"] += sum(statuses.values())
+                entry["by_endpoint"][endpoint] = {str(s): n for s, n in sorted(statuses.items())}
+            for service, seconds in self._latency.items():
+                out.setdefault(service, {"requests": 0, "by_endpoint": {}, "latency_s": 0.0})["latency_s"] = round(seconds, 3)
+            return out
+
+    def _record(self, service: str, endpoint: str, status: int, seconds: float):
+        with self._lock:
+            self._counts[(service, endpoint)][status] += 1
+            self._latency[service] += seconds
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    # --- routing ---
+
+    def route(self, method: str, path: str, query: Dict, body: bytes) -> Tuple[str, str, int, Dict, str, str]:
+        """Return (service, endpoint, status, headers, content type, body)."""
+        if path.startswith("/dab/api"):
+            return ("dab",) + self._dab(method, path[len("/dab/api"):], query)
+        if path.startswith("/spotify/"):
+            return ("spotify",) + self._spotify(method, path[len("/spotify"):], query)
+        if path.startswith("/qobuz/"):
+            return ("qobuz",) + self._qobuz(query)
+        if path.startswith("/ws/2/"):
+            return ("musicbrainz",) + self._musicbrainz(path[len("/ws/2"):], query)
+        return "unknown", path, 404, {}, "application/json", json.dumps({"error": "not found"})
+
+    def _json(self, endpoint: str, payload, status: int = 200):
+        return endpoint, status, {}, "application/json", json.dumps(payload)
+
+    def _dab(self, method: str, path: str, query: Dict):
+        cat = self.catalog
+        if path == "/auth/me":
+            return self._json("/auth/me", {"user": {"id": 1, "username": "bench"}})
+        if path == "/search":
+            q = query.get("q", [""])[0]
+            m = _ISRC_RE.match(q)
+            if m:
+                i = int(m.group(1))
+                return self._json("/search", {"tracks": [cat.dab_track(i)] if cat.isrc_indexed(i) else []})
+            m = _SONG_RE.search(q)
+            i = int(m.group(1)) if m else -1
+            results = []
+            if cat.in_dab(i):
+                results.append(cat.dab_track(i))
+                results.extend(cat.dab_track(j) for j in range(i + 1, i + 1 + SEARCH_DECOYS) if cat.in_dab(j))
+            return self._json("/search", {"tracks": results})
+        if path == "/libraries" and method == "POST":
+            return self._json("/libraries", {"library": {"id": LIBRARY_ID}}, 201)
+        if path.startswith("/libraries/"):
+            if path.endswith("/tracks"):
+                return self._json("/libraries/<id>/tracks", {"success": True}, 201)
+            return self._json("/libraries/<id>", {"library": {"id": LIBRARY_ID}})
+        return self._json(path, {"error": "not found"}, 404)
+
+    def _spotify(self, method: str, path: str, query: Dict):
+        cat = self.catalog
+        if path == "/api/token":
+            return self._json("/api/token", {"access_token": "bench", "token_type": "Bearer", "expires_in": 3600})
+        if path == "/v1/tracks" or path == "/v1/tracks/":
+            ids = query.get("ids", [""])[0].split(",")
+            return self._json("/v1/tracks", {"tracks": [cat.spotify_track(int(t[5:])) for t in ids if t]})
+        if path.startswith("/v1/playlists/"):
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            page = {
+                "items": [{"track": cat.spotify_track(i)} for i in range(offset, min(offset + limit, cat.tracks))],
+                "total": cat.tracks, "offset": offset, "limit": limit,
+            }
+            if path.endswith("/items"):
+                return self._json("/v1/playlists/<id>/items", page)
+            return self._json("/v1/playlists/<id>", {
+                "name": f"Benchmark {cat.tracks}", "description": "Synthetic benchmark playlist",
+                "snapshot_id": f"bench-{cat.tracks}", "tracks": page,
+            })
+        return self._json(path, {"error": {"status": 404, "message": "not found"}}, 404)
+
+    def _qobuz(self, query: Dict):
+        m = _ISRC_RE.match(query.get("query", [""])[0])
+        items = []
+        if m and self.catalog.in_dab(int(m.group(1))):
+            i = int(m.group(1))
+            items.append({"id": i + 1, "isrc": self.catalog.isrc(i)})
+        return self._json("/track/search", {"tracks": {"items": items, "total": len(items)}})
+
+    def _musicbrainz(self, path: str, query: Dict):
+        cat = self.catalog
+        if path.startswith("/isrc/"):
+            m = _ISRC_RE.match(unquote(path[len("/isrc/"):]).strip("/"))
+            if not m or not (0 <= int(m.group(1)) < cat.tracks):
+                return "/isrc", 404, {}, "application/xml", f'<?xml version="1.0"?><error {_MB_NS}><text>Not Found</text></error>'
+            i = int(m.group(1))
+            body = (f'<?xml version="1.0" encoding="UTF-8"?><metadata {_MB_NS}><isrc id="{cat.isrc(i)}">'
+                    f'<recording-list count="1">{cat.mb_recording(i)}</recording-list></isrc></metadata>')
+            return "/isrc", 200, {}, "application/xml", body
+        if path.startswith("/recording"):
+            found = [int(n) for n in _SONG_RE.findall(query.get("query", [""])[0])]
+            recordings = "".join(cat.mb_recording(i) for i in found if 0 <= i < cat.tracks)
+            body = (f'<?xml version="1.0" encoding="UTF-8"?><metadata {_MB_NS}>'
+                    f'<recording-list count="{len(found)}" offset="0">{recordings}</recording-list></metadata>')
+            return "/recording", 200, {}, "application/xml", body
+        return "/" + path.strip("/").split("/")[0], 404, {}, "application/xml", "<error/>"
+
+
+def _handler_for(services: MockServices):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out as separate writes; without this,
+            # Nagle + delayed ACK add ~40 ms to every keep-alive response
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def _serve(self, method: str):
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            url = urlsplit(self.path)
+            service, endpoint, status, headers, ctype, payload = services.route(
+                method, url.path, parse_qs(url.query), body
+            )
+
+            behaviour = services.behaviour.get(service, Behaviour())
+            if behaviour.latency_ms:
+                time.sleep(behaviour.latency_ms / 1000)
+            roll = services._roll()
+            if behaviour.over_limit() or roll < behaviour.throttle_rate:
+                status, headers, ctype = 429, {"Retry-After": str(behaviour.retry_after)}, "application/json"
+                payload = json.dumps({"error": "Too Many Requests"})
+            elif roll < behaviour.throttle_rate + behaviour.error_rate:
+                status, headers, ctype, payload = 500, {}, "application/json", json.dumps({"error": "Internal Server Error"})
+
+            data = payload.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+            services._record(service, endpoint, status, time.perf_counter() - started)
+
+        def do_GET(self):
+            self._serve("GET")
+
+        def do_POST(self):
+            self._serve("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the DABHounds benchmark stand-ins")
+    parser.add_argument("--tracks", type=int, default=1000, help="Synthetic playlist length")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    services = MockServices(SyntheticCatalog(args.tracks), port=args.port).start()
+    print(f"Serving stand-ins on {services.base_url} (playlist '{PLAYLIST_ID}', {args.tracks} tracks); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(services.stats(), indent=2))
+        services.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,23 @@
 # dabhounds/cli.py
 
 import argparse
+import heapq
+import json
 import sys
 import os
+import time
 from datetime import datetime
 from pathlib import Path
+import signal
 import subprocess
-import requests
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from spotipy import Spotify
-from spotipy.oauth2 import SpotifyClientCredentials
-
-from dabhounds.core.spotify import SpotifyFetcher
-from dabhounds.core.youtube_parser_v3 import YouTubeParserV3
-from dabhounds.core.dab import match_track
-from dabhounds.core.library import create_library, add_tracks_to_library, library_exists
-from dabhounds.core.report import generate_report, load_report, append_tracks_to_report
-from dabhounds.core.auth import login, ensure_logged_in, load_config, save_config
-from dabhounds.core.spotify_auth import get_spotify_client, spotify_logout
-
-# Load configuration
-cfg = load_config()
+# Subsystems (spotipy, yt_dlp, rapidfuzz, musicbrainzngs, requests) are
+# imported where they are first needed, so --version, --credits and the
+# menu start without loading them.
+from dabhounds.core.auth import CONFIG_FILE, login, ensure_config, ensure_logged_in, load_config, save_config
 
 ASCII_ART = r"""
   _____          ____  _    _                       _         
@@ -54,6 +51,33 @@ Available Commands:
   dabhounds --threshold <0-100>
       → Override fuzzy match threshold
 
+  dabhounds <link> --workers <N>
+      → Match tracks on N concurrent workers
+
+  dabhounds <link> --engine async
+      → Run DAB I/O on one asyncio event loop (needs aiohttp)
+
+  dabhounds <link> --no-cache | --refresh
+      → Bypass cached lookups, or refetch and re-cache them
+
+  dabhounds --batch <file> [--parallel N]
+      → Convert every link listed in a file (- reads stdin)
+
+  dabhounds watch
+      → Keep resyncing the links listed under WATCH_SOURCES in config.json
+
+  dabhounds <link> --resume
+      → Continue a conversion that was interrupted (Ctrl+C, crash)
+
+  dabhounds <link> --export-report
+      → Write the TXT/JSON report of a link (all reports without a link)
+
+  dabhounds <link> --metrics <file.json>
+      → Save per-stage timings, request counts and cache hit ratios
+
+  dabhounds <link> --trace <file.json>
+      → Save a timeline of every request and stage (open in Perfetto)
+
   dabhounds --version
       → Show DABHounds version
 
@@ -88,19 +112,23 @@ def load_version():
         except ImportError:
             return "0.0.0"
 
-VERSION_URL = "https://raw.githubusercontent.com/sherlockholmesat221b/DABHounds/main/VERSION"
-
-def check_latest_version(local_version):
-    try:
-        r = requests.get(VERSION_URL, timeout=5)
-        r.raise_for_status()
-        remote_version = r.text.strip()
-        if remote_version != local_version:
-            print(f"[DABHound] New version available: {remote_version} (current: {local_version}). Run --update to update.")
-        else:
-            print(f"[DABHound] You are running the latest version ({local_version}).")
-    except Exception as e:
-        print(f"[DABHound] Could not check for updates: {e}")
+def check_latest_version(local_version, wait=0):
+    """Print how the local version compares to the latest release.
+
+    The latest version is cached for a day (see core/version_check.py);
+    ``wait`` bounds how long to wait for a refresh already running in the
+    background. Returns False when the comparison could not be made.
+    """
+    from dabhounds.core import version_check
+    remote_version = version_check.latest_version(wait=wait)
+    if not remote_version:
+        print(f"[DABHound] Could not check for updates: {version_check.last_error() or 'no answer yet'}")
+        return False
+    if remote_version != local_version:
+        print(f"[DABHound] New version available: {remote_version} (current: {local_version}). Run --update to update.")
+    else:
+        print(f"[DABHound] You are running the latest version ({local_version}).")
+    return True
 
 def perform_update():
     try:
@@ -121,146 +149,329 @@ def logout():
     for key in ["DAB_AUTH_TOKEN", "DAB_EMAIL", "DAB_PASSWORD", "SPOTIFY_TOKEN"]:
         cfg.pop(key, None)
     save_config(cfg)
+    from dabhounds.core.spotify_auth import spotify_logout
     cache_path = ".cache-dabhound"
     if os.path.exists(cache_path):
         os.remove(cache_path)
     spotify_logout()
     print("[DABHound] Logged out and cleared credentials.")
 
-def main():
-    parser = argparse.ArgumentParser(description="DABHounds: Convert Spotify or YouTube to DAB libraries")
-    parser.add_argument("link", nargs="?", help="Spotify/YouTube/ISRC input")
-    parser.add_argument("--mode", choices=["strict","lenient","manual"], default=None)
-    parser.add_argument("--version", action="store_true")
-    parser.add_argument("--update", action="store_true")
-    parser.add_argument("--login", action="store_true")
-    parser.add_argument("--logout", action="store_true")
-    parser.add_argument("--spotify-login", action="store_true")
-    parser.add_argument("--credits", action="store_true")
-    parser.add_argument("--threshold", type=int, help="Override fuzzy threshold 0-100")
-    args = parser.parse_args()
-
-    fuzzy_threshold = args.threshold or cfg.get("FUZZY_THRESHOLD", 80)
-
-    if len(sys.argv) == 1:
-        show_main_menu()
-        sys.exit(0)
-
-    if args.credits:
-        show_credits()
-        sys.exit(0)
-
-    if args.version:
-        print(f"DABHounds v{load_version()}")
-        check_latest_version(load_version())
-        sys.exit(0)
-
-    if args.update:
-        confirm = input("This will upgrade DABHounds via pip. Continue? (y/N): ").strip().lower()
-        if confirm == "y":
-            perform_update()
-        sys.exit(0)
-
-    if args.logout:
-        logout()
-        sys.exit(0)
-
-    if args.login:
-        email = input("Email: ").strip()
-        password = input("Password: ").strip()
-        login(email, password)
-        sys.exit(0)
-
-    if args.spotify_login:
-        sp = get_spotify_client()
-        print(f"[DABHound] Spotify login successful as: {sp.current_user()['display_name']}")
-        sys.exit(0)
-
-    if not args.link:
-        parser.print_help()
-        sys.exit(1)
-
-    # strip input URL and remove tracking parameters
-    link = args.link.strip()
-    
-    # Remove ?si= parameter from Spotify links
-    if "?si=" in link:
-        link = link.split("?si=")[0]
-    
-    # Remove &si= parameter from Spotify links
-    if "&si=" in link:
-        link = link.split("&si=")[0]
-    
-    print(f"[DABHound] Input URL: {link}")
-    match_mode = args.mode or cfg.get("MATCH_MODE", "lenient")
-    token = ensure_logged_in()
-
-    # === TRACK FETCHING ===
-    library_name_from_spotify = None
-    library_description_from_spotify = None
-    library_name_from_youtube = None
-    library_description_from_youtube = None
-    tracks = []
+def open_source(link: str, sync_state=None, known_ids=None):
+    """Fetch a link's metadata and return a lazy track stream.
+
+    Returns {"name", "description", "total", "tracks"} where "tracks" is an
+    iterator of normalized tracks (total may be None), or None for
+    unsupported links. ``known_ids`` holds the source IDs (Spotify track
+    IDs or YouTube video IDs) already in the previous report; together
+    with ``sync_state`` for Spotify playlists, they allow an incremental
+    resync. The result then also carries "unchanged" and, for Spotify,
+    the new "sync_state".
+    """
+    cfg = load_config()
     if is_spotify_url(link):
         print("[DABHound] Detected Spotify link")
+        from spotipy import Spotify
+        from spotipy.oauth2 import SpotifyClientCredentials
+        from dabhounds.core.spotify import SpotifyFetcher
+        from dabhounds.core.spotify_auth import get_spotify_client
         try:
             public_sp = Spotify(auth_manager=SpotifyClientCredentials(
                 client_id=cfg.get("SPOTIPY_CLIENT_ID"),
                 client_secret=cfg.get("SPOTIPY_CLIENT_SECRET")
             ))
             fetcher = SpotifyFetcher(public_sp)
-            spotify_data = fetcher.extract_tracks(link)
+            spotify_data = fetcher.extract_tracks(link, stream=True, sync_state=sync_state, known_ids=known_ids)
         except Exception:
             print("[DABHound] Private/restricted playlist. Logging in...")
             sp = get_spotify_client()
             fetcher = SpotifyFetcher(sp)
-            spotify_data = fetcher.extract_tracks(link)
-    
-        # Unpack
+            spotify_data = fetcher.extract_tracks(link, stream=True, sync_state=sync_state, known_ids=known_ids)
+
         tracks = spotify_data.get("tracks", [])
-        library_name_from_spotify = spotify_data.get("name")
-        library_description_from_spotify = spotify_data.get("description")
-    
-        for t in tracks:
-            t["source_url"] = link
-    elif is_youtube_url(link):
+
+        def spotify_tracks():
+            for t in tracks:
+                t["source_url"] = link
+                yield t
+
+        return {
+            "name": spotify_data.get("name"),
+            "description": spotify_data.get("description"),
+            "total": spotify_data.get("total") or (len(tracks) if isinstance(tracks, list) else None),
+            "tracks": spotify_tracks(),
+            "unchanged": spotify_data.get("unchanged", False),
+            "sync_state": spotify_data.get("sync_state"),
+        }
+
+    if is_youtube_url(link):
         print("[DABHound] Detected YouTube link")
+        from dabhounds.core.youtube_parser_v3 import YouTubeParserV3
         parser_y = YouTubeParserV3(cfg.get("YOUTUBE", {}))
-        yt_data = parser_y.parse(link)
-        
-        tracks = yt_data["tracks"]
-        library_name_from_youtube = yt_data.get("playlist_title")
-        library_description_from_youtube = yt_data.get("playlist_description")
-        
-        for t in tracks:
-            if "safe_title" in t:
-                t["title"] = t["safe_title"]
-            if "safe_artist" in t and t["safe_artist"]:
-                t["artist"] = t["safe_artist"]
-            if not t.get("artist") or "youtube" in t["artist"].lower():
-                if " - " in t["title"]:
-                    parts = t["title"].split(" - ", 1)
-                    t["artist"], t["title"] = parts[0], parts[1]
-            t["source_url"] = link
-    else:
-        print("[DABHound] Only Spotify and YouTube are supported")
-        sys.exit(1)
+        yt_data = parser_y.stream(link, known_ids=known_ids)
+
+        def youtube_tracks():
+            for t in yt_data["tracks"]:
+                if "safe_title" in t:
+                    t["title"] = t["safe_title"]
+                if "safe_artist" in t and t["safe_artist"]:
+                    t["artist"] = t["safe_artist"]
+                if not t.get("artist") or "youtube" in t["artist"].lower():
+                    if " - " in t["title"]:
+                        parts = t["title"].split(" - ", 1)
+                        t["artist"], t["title"] = parts[0], parts[1]
+                t["source_url"] = link
+                yield t
+
+        if yt_data.get("video_count"):
+            print(f"[DABHound] Found {yt_data['video_count']} videos")
+        if yt_data.get("known_count"):
+            print(f"[DABHound] Skipping {yt_data['known_count']} videos already synced")
+        return {
+            "name": yt_data.get("playlist_title"),
+            "description": yt_data.get("playlist_description"),
+            "total": None,  # chapters are only known once each video is extracted
+            "tracks": youtube_tracks(),
+            "unchanged": bool(yt_data.get("video_count")) and yt_data.get("known_count") == yt_data.get("video_count"),
+            "known": yt_data.get("known_count", 0),  # videos dropped before extraction
+        }
+
+    return None
+
+def finish_metrics(args, total: int, matched: int):
+    """Close the run's metrics and trace and write them where --metrics/--trace asked."""
+    from dabhounds.core import metrics, trace
+    metrics.track_counts(total, matched)
+    data = metrics.finish()
+    if args.metrics and data is not None:
+        Path(args.metrics).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"[DABHound] Metrics written to {args.metrics}")
+    events = trace.finish()
+    if args.trace and events is not None:
+        Path(args.trace).write_text(json.dumps(events), encoding="utf-8")
+        print(f"[DABHound] Trace written to {args.trace} (open it in https://ui.perfetto.dev)")
+
+def _build_matched_entry(track: dict, result: dict) -> dict:
+    """Shape a match result the way the library/report writers expect it."""
+    if result:
+        return {
+            "artist": result.get("artist", track.get("artist")),
+            "title": result.get("title", track.get("title")),
+            "isrc": track.get("isrc"),
+            "match_status": "FOUND",
+            "dab_track_id": result.get("id"),
+            "source_url": track.get("source_url"),
+            "full_track": result  # <--- attach the full DAB track dict
+        }
+    return {
+        "artist": track.get("artist"),
+        "title": track.get("title"),
+        "isrc": track.get("isrc"),
+        "match_status": "NOT_FOUND",
+        "dab_track_id": None,
+        "source_url": track.get("source_url"),
+    }
+
+def match_tracks(tracks, match_mode, token, fuzzy_threshold, workers=1, engine=None, on_match=None, total=None,
+                 verbose=True, replay=None, on_result=None):
+    """Match tracks against DAB and return (matched_tracks, match_results) in playlist order.
+
+    With workers > 1, match_track() runs on a bounded thread pool. Every worker
+    draws from the same DAB token bucket, so the request rate is unchanged; the
+    pool only overlaps the network latency of in-flight requests. With an
+    AsyncEngine, the same happens as coroutines on its event loop. Results are
+    printed (unless ``verbose`` is False) and collected strictly in input
+    order, and each entry is handed to on_match (e.g. LibraryWriter.submit)
+    as soon as its turn comes.
+
+    ``replay`` maps journal.track_key() to results of an interrupted run;
+    those tracks are not looked up again. Every other result is handed to
+    on_result(track, result) (e.g. journal.record) before on_match.
+    """
+    from dabhounds.core import metrics
+    from dabhounds.core.dab import match_track
+    from dabhounds.core.journal import track_key
+
+    matched_tracks = []
+    match_results = []
+    if total is None and hasattr(tracks, "__len__"):
+        total = len(tracks)
+    replay = replay or {}
+
+    def report(idx, track, result):
+        if replay and track_key(track) in replay:
+            metrics.incr("match.journal")
+        elif on_result:
+            on_result(track, result)
+        match_results.append(result or {})
+        if verbose:
+            progress = f"{idx}/{total}" if total else f"{idx}"
+            print(f"\n[DABHound] Matching ({progress}): {track.get('artist','')} - {track.get('title','')}")
+            if result:
+                print(f"[DABHound] Match found: {result.get('artist','')} - {result.get('title','')} (DAB ID: {result.get('id')})")
+            else:
+                print(f"[DABHound] No match found for: {track.get('artist','')} - {track.get('title','')}")
+        entry = _build_matched_entry(track, result)
+        matched_tracks.append(entry)
+        if on_match:
+            on_match(entry)
+
+    if engine is not None:
+        engine.run(engine.match_tracks(tracks, match_mode, fuzzy_threshold, report, replay=replay))
+        return matched_tracks, match_results
+
+    def match(track):
+        key = track_key(track) if replay else None
+        if key in replay:
+            return replay[key]
+        return match_track(track, match_mode, token, fuzzy_threshold)
+
+    if workers <= 1:
+        for idx, track in enumerate(tracks, start=1):
+            report(idx, track, match(track))
+        return matched_tracks, match_results
+
+    # Keep a small window of submitted work so memory stays bounded on huge playlists
+    window = workers * 4
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dabhound-match") as pool:
+        try:
+            for idx, track in enumerate(tracks, start=1):
+                pending.append((idx, track, pool.submit(match, track)))
+                if len(pending) >= window:
+                    i, t, fut = pending.popleft()
+                    report(i, t, fut.result())
+            while pending:
+                i, t, fut = pending.popleft()
+                report(i, t, fut.result())
+        except BaseException:
+            # Don't start lookups whose results would be thrown away
+            for _, _, fut in pending:
+                fut.cancel()
+            raise
+
+    return matched_tracks, match_results
+
+def normalize_link(link: str) -> str:
+    """Strip whitespace and Spotify's share-tracking parameters from a link."""
+    link = link.strip()
 
-    if not tracks:
-        print("[DABHound] No tracks found")
-        sys.exit(1)
+    # Remove ?si= parameter from Spotify links
+    if "?si=" in link:
+        link = link.split("?si=")[0]
 
-    print(f"[DABHound] Found {len(tracks)} tracks")
+    # Remove &si= parameter from Spotify links
+    if "&si=" in link:
+        link = link.split("&si=")[0]
+
+    return link
+
+class RunContext:
+    """State shared by every conversion of one invocation.
+
+    Holds the config, the DAB login, the keep-alive transport and the I/O
+    engine, so a batch of links logs in once and draws from one rate budget.
+    ``parallel`` is how many conversions will run at once. Setting
+    ``stopping`` (first Ctrl+C) makes every conversion finish the tracks in
+    flight and stop, leaving its journal for --resume.
+    """
+
+    def __init__(self, args, cfg: dict, parallel: int = 1):
+        from dabhounds.core.cache import set_cache_mode
+        from dabhounds.core.http import get_transport
+
+        self.cfg = cfg
+        if args.no_cache or not cfg.get("CACHE_ENABLED", True):
+            set_cache_mode("off")
+        elif args.refresh:
+            set_cache_mode("refresh")
+        self.match_mode = args.mode or cfg.get("MATCH_MODE", "lenient")
+        self.fuzzy_threshold = args.threshold or cfg.get("FUZZY_THRESHOLD", 80)
+        self.token = ensure_logged_in()
+        self.resume = args.resume
+        self.stopping = threading.Event()
+        # Batch runs print one line per link instead of one per track and
+        # leave the report viewer closed
+        self.verbose = True
+        self.show_report = True
+
+        # === I/O ENGINE ===
+        self.workers = args.workers or cfg.get("WORKERS", 1)
+        if self.match_mode == "manual" and self.workers > 1:
+            print("[DABHound] Manual mode is interactive; ignoring --workers.")
+            self.workers = 1
+
+        # One keep-alive connection per worker, already logged in
+        transport = get_transport()
+        transport.configure(self.workers * parallel)
+        transport.set_token(self.token)
+
+        self.engine = None
+        if (args.engine or cfg.get("ENGINE", "sync")) == "async":
+            if self.match_mode == "manual":
+                print("[DABHound] Manual mode is interactive; using the sync engine.")
+            else:
+                from dabhounds.core.async_engine import AsyncEngine, DEFAULT_CONCURRENCY
+                # Raises RuntimeError when aiohttp is missing
+                self.engine = AsyncEngine(self.token, concurrency=args.workers or max(self.workers, DEFAULT_CONCURRENCY))
+
+    def close(self):
+        from dabhounds.core.qobuz import close_qobuz_client
+        if self.engine:
+            self.engine.close()
+        close_qobuz_client()
+
+def convert_link(link: str, run: RunContext) -> dict:
+    """Convert (or resync) one link into its DAB library and write its report.
+
+    Every match result is journaled as it comes in and every library add is
+    recorded in the library ledger, so with ``run.resume`` an interrupted
+    conversion continues without repeating searches or POSTs.
+
+    Returns a summary: ``status`` is "converted", "unchanged" (nothing new
+    since the last sync), "empty" (no tracks found), "unsupported" or
+    "interrupted", with the number of tracks processed and matched and the
+    library written to.
+    """
+    from dabhounds.core import journal, metrics
+    from dabhounds.core.library import create_library, library_exists, LibraryWriter
+    from dabhounds.core.qobuz import prefetch_qobuz_ids
+    from dabhounds.core import report_store
+    from dabhounds.core.report import generate_report, get_report, append_tracks_to_report
+    from dabhounds.core.streaming import BoundedPrefetch
+
+    cfg, engine, match_mode = run.cfg, run.engine, run.match_mode
+    summary = {"link": link, "status": "converted", "tracks": 0, "matched": 0, "added": 0,
+               "library_id": None, "library_name": None}
+    if run.stopping.is_set():
+        return dict(summary, status="interrupted")
+    check_library = (lambda i: engine.run(engine.library_exists(i))) if engine else library_exists
+
+    # === RESUME ===
+    replay = None
+    interrupted = journal.get(link)
+    if interrupted and not run.resume:
+        print("[DABHound] Discarding the progress of an interrupted conversion of this link (use --resume to continue it).")
+    elif interrupted and (interrupted["matching_mode"], interrupted["threshold"]) != (match_mode, run.fuzzy_threshold):
+        print(f"[DABHound] The interrupted conversion used {interrupted['matching_mode']} mode at threshold "
+              f"{interrupted['threshold']}; starting over.")
+    elif interrupted:
+        replay = journal.results(link)
+        print(f"[DABHound] Resuming an interrupted conversion; {len(replay)} tracks already matched.")
+        if interrupted["library_id"] and not check_library(interrupted["library_id"]):
+            interrupted["library_id"] = None
+    elif run.resume:
+        print("[DABHound] Nothing to resume for this link; converting it as usual.")
 
     # === SYNC DETECTION & TRACK PROCESSING ===
-    existing_report = load_report(link)
+    existing_report = get_report(link)
     append_mode = False
     existing_ids = set()
+    known_source_ids = set()
     
     if existing_report:
         library_id = existing_report.get("library_id")
     
-        if library_id and not library_exists(library_id):
+        if library_id and not check_library(library_id):
             print("[DABHound] Previous DAB library no longer exists. Cleaning up old report...")
 
             # delete old report file(s)
@@ -269,11 +480,12 @@ def main():
     
             # reset state - treat as new conversion
             existing_report = None
-            tracks_to_process = tracks[:]
             print("[DABHound] Starting fresh conversion; processing all tracks.")
         else:
             # Library exists, check for duplicates
-            for t in existing_report.get("tracks", []):
+            for t in report_store.track_keys(link):
+                if t.get("spotify_id") or t.get("yt_id"):
+                    known_source_ids.add(t.get("spotify_id") or t["yt_id"])
                 if "spotify_id" in t:
                     existing_ids.add(t["spotify_id"])
                 elif "yt_id" in t:
@@ -282,104 +494,473 @@ def main():
                     existing_ids.add(t["isrc"])
                 else:
                     existing_ids.add(f"{t['artist']} - {t['title']}")
-    
-            tracks_to_process = []
-            for t in tracks:
-                track_id = t.get("spotify_id") or t.get("yt_id") or t.get("isrc") or f"{t['artist']} - {t['title']}"
-                if track_id not in existing_ids:
-                    tracks_to_process.append(t)
-    
-            skipped_count = len(tracks) - len(tracks_to_process)
-            if skipped_count:
-                print(f"[DABHound] {skipped_count} tracks already present in report; processing {len(tracks_to_process)} new tracks.")
-            else:
-                print("[DABHound] No previously-synced tracks found; processing all tracks.")
-    
             append_mode = True
     else:
-        tracks_to_process = tracks[:]
         print("[DABHound] No previously-synced tracks; processing all tracks.")
 
-    # === MATCHING TRACKS ===  
-    matched_tracks = []  
-    match_results = []  
-    for idx, track in enumerate(tracks_to_process, start=1):  
-        print(f"\n[DABHound] Matching ({idx}/{len(tracks_to_process)}): {track.get('artist','')} - {track.get('title','')}")  
-        result = match_track(track, match_mode, token, fuzzy_threshold)  
-        match_results.append(result or {})  
-
-        if result:  
-            print(f"[DABHound] Match found: {result.get('artist','')} - {result.get('title','')} (DAB ID: {result.get('id')})")  
-            matched_tracks.append({  
-                "artist": result.get("artist", track.get("artist")),  
-                "title": result.get("title", track.get("title")),  
-                "isrc": track.get("isrc"),  
-                "match_status": "FOUND",  
-                "dab_track_id": result.get("id"),  
-                "source_url": track.get("source_url"),  
-                "full_track": result  # <--- attach the full DAB track dict  
-            })  
-        else:  
-            print(f"[DABHound] No match found for: {track.get('artist','')} - {track.get('title','')}")  
-            matched_tracks.append({  
-                "artist": track.get("artist"),  
-                "title": track.get("title"),  
-                "isrc": track.get("isrc"),  
-                "match_status": "NOT_FOUND",  
-                "dab_track_id": None,  
-                "source_url": track.get("source_url"),  
-            })
+    # === TRACK FETCHING ===
+    # Only metadata is fetched here; tracks stream in while matching runs.
+    # Reports written before source IDs were stored cannot drive an
+    # incremental resync, so they get one full pass first.
+    sync_state = existing_report.get("spotify_snapshot") if append_mode else None
+    with metrics.stage("run.open_source"):
+        source = open_source(link, sync_state=sync_state, known_ids=known_source_ids or None)
+    if source is None:
+        print("[DABHound] Only Spotify and YouTube are supported")
+        return dict(summary, status="unsupported")
+
+    if source.get("unchanged"):
+        print("[DABHound] No new tracks since the last sync; nothing to do.")
+        journal.clear(link)
+        return dict(summary, status="unchanged", library_id=existing_report.get("library_id"),
+                    library_name=existing_report.get("library_name"))
+
+    if source.get("total"):
+        print(f"[DABHound] Found {source['total']} tracks")
+
+    seen = [0]
+
+    def new_tracks():
+        """Drop tracks already in the report and warm the Qobuz cache, ahead of the matcher."""
+        for t in source["tracks"]:
+            seen[0] += 1
+            # Older reports only hold ISRCs or "artist - title", so try every key
+            keys = (t.get("spotify_id"), t.get("youtube_id"), t.get("isrc"), f"{t['artist']} - {t['title']}")
+            if any(k in existing_ids for k in keys if k):
+                continue
+            if match_mode != "manual":
+                prefetch_qobuz_ids([t.get("isrc")])
+            yield t
+
+    tracks_to_process = []
+    fetched = BoundedPrefetch(new_tracks(), maxsize=cfg.get("FETCH_QUEUE_SIZE", 256))
+
+    stopped = [False]
+
+    def consumed():
+        for t in fetched:
+            if run.stopping.is_set():
+                stopped[0] = True
+                break
+            tracks_to_process.append(t)
+            yield t
+
+    # === LIBRARY TARGET ===
+    # Tracks are written by a background writer as soon as they match, so the
+    # library must be known (or creatable on first match) before matching.
+    if append_mode and existing_report:
+        library_id = existing_report.get("library_id", "(none)")
+        library_name = existing_report.get("library_name", 
+                                       f"DABHounds {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        print(f"[DABHound] Adding new tracks to existing library: {library_name}")
+        create = None
+    elif replay is not None and interrupted["library_id"]:
+        library_id, library_name = interrupted["library_id"], interrupted["library_name"]
+        print(f"[DABHound] Adding to the library of the interrupted conversion: {library_name}")
+        create = None
+    else:
+        library_id = None
+        # Use Spotify/YouTube name and description if available, else fallback
+        library_name = source.get("name") or f"DABHounds {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        library_description = source.get("description") or "Created by DABHounds"
+
+        def create_library_on_first_match():
+            print(f"[DABHound] Creating new library: {library_name}")
+            if engine:
+                new_id = engine.run(engine.create_library(library_name, description=library_description, is_public=True))
+            else:
+                new_id = create_library(library_name, description=library_description, is_public=True)
+            # A resume must add to this library rather than create another
+            journal.set_library(link, new_id, library_name)
+            return new_id
+
+        create = create_library_on_first_match
+
+    post = (lambda lib, track: engine.run(engine.post_track(lib, track))) if engine else None
+    writer = LibraryWriter(library_id, create=create, post=post).start()
+    if replay is None:
+        journal.begin(link, match_mode, run.fuzzy_threshold, library_id if append_mode else None, library_name)
+
+    # === MATCHING TRACKS ===
+    total = None if append_mode else source.get("total")
+    try:
+        with metrics.stage("run.match"):
+            matched_tracks, match_results = match_tracks(consumed(), match_mode, run.token, run.fuzzy_threshold,
+                                                         run.workers, engine, on_match=writer.submit, total=total,
+                                                         verbose=run.verbose, replay=replay,
+                                                         on_result=lambda t, r: journal.record(link, t, r))
+    finally:
+        fetched.close()
+
+    if append_mode:
+        # Incremental resyncs never yield known tracks, so count against the
+        # playlist total (Spotify) or the videos dropped after listing (YouTube)
+        skipped_count = max(seen[0], source.get("total") or 0) + source.get("known", 0) - len(tracks_to_process)
+        if skipped_count:
+            print(f"[DABHound] {skipped_count} tracks already present in report; processed {len(tracks_to_process)} new tracks.")
+        else:
+            print("[DABHound] No previously-synced tracks found; processed all tracks.")
 
     # === LIBRARY CREATION / UPDATE ===
-    library_id = "(none)"
-    library_name = "(none)"
+    with metrics.stage("run.library_drain"):
+        library_id = writer.close() or "(none)"
+
+    summary.update(
+        tracks=len(tracks_to_process),
+        matched=sum(1 for m in matched_tracks if m["dab_track_id"]),
+        added=writer.added,
+    )
+
+    if stopped[0]:
+        # The report is only written once the whole source is done; the journal holds the rest
+        print(f"[DABHound] Stopped after {len(tracks_to_process)} tracks. Continue with: dabhounds {link} --resume")
+        return dict(summary, status="interrupted", library_id=writer.library_id, library_name=library_name)
+
+    if not seen[0] and not (append_mode and source.get("total")):
+        print("[DABHound] No tracks found")
+        journal.clear(link)
+        return dict(summary, status="empty")
+
+    if writer.added:
+        print(f"[DABHound] Library updated! Link: https://dabmusic.xyz/shared/library/{library_id}")
+    elif append_mode and existing_report:
+        print("[DABHound] No new matches found to append; using existing library info.")
+    elif library_id == "(none)":
+        library_name = "(none)"
+        print("[DABHound] No tracks matched; skipping library creation.")
+
+    # === REPORT WRITING (TXT + JSON) ===
+    # The snapshot is only worth keeping if every page was read
+    state = source.get("sync_state") or {}
+    sync_state = {k: state[k] for k in ("snapshot_id", "page_size", "pages")} if state.get("complete") else None
 
-    if matched_tracks:
+    with metrics.stage("run.report"):
         if append_mode and existing_report:
-            library_id = existing_report.get("library_id", "(none)")
-            library_name = existing_report.get("library_name", 
-                                           f"DABHounds {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-            print(f"[DABHound] Adding new tracks to existing library: {library_name}")
+            append_tracks_to_report(
+                link,
+                [dict(t, dab_track_id=m["dab_track_id"]) for t, m in zip(tracks_to_process, matched_tracks)],
+                library_id=library_id,
+                library_name=library_name,
+                matching_mode=match_mode,
+                sync_state=sync_state,
+                show=run.show_report
+            )
         else:
-            # Use Spotify/YouTube name and description if available, else fallback
-            library_name = library_name_from_spotify or library_name_from_youtube or f"DABHounds {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-            library_description = library_description_from_spotify or library_description_from_youtube or "Created by DABHounds"
-            print(f"[DABHound] Creating new library: {library_name}")
-            library_id = create_library(library_name, description=library_description, is_public=True)
-            print(f"[DABHound] Library created. ID: {library_id}")
+            generate_report(
+                tracks_to_process,
+                matched_tracks,
+                match_results,
+                match_mode,
+                library_name,
+                library_id,
+                source_url=link,
+                sync_state=sync_state,
+                show=run.show_report
+            )
+
+    journal.clear(link)
+    print(f"[DABHound] Conversion complete. Reports written for {len(matched_tracks)} tracks.")
+    return dict(summary, library_id=library_id, library_name=library_name)
 
-        if matched_tracks:
-            add_tracks_to_library(library_id, matched_tracks)
-            print(f"[DABHound] Library updated! Link: https://dabmusic.xyz/shared/library/{library_id}")
+def read_batch_links(path: str) -> list:
+    """Links listed in a batch file (``-`` reads stdin), one per line.
+
+    Blank lines and lines starting with # are skipped, and a link listed
+    more than once is converted once.
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
     else:
-        if append_mode and existing_report:
-            library_id = existing_report.get("library_id", "(none)")
-            library_name = existing_report.get("library_name", "(none)")
-            print("[DABHound] No new matches found to append; using existing library info.")
-        else:
-            print("[DABHound] No tracks matched; skipping library creation.")
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    links = []
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        link = normalize_link(line)
+        if link not in links:
+            links.append(link)
+    return links
+
+def run_batch(links: list, run: RunContext, parallel: int) -> list:
+    """Convert ``links`` with up to ``parallel`` at a time; returns their summaries in order.
+
+    All conversions share the run's login, transport, rate limiter and
+    caches, and a track found in several playlists is only matched once.
+    One failing link is reported and does not stop the others.
+    """
+    def convert(link):
+        try:
+            return convert_link(link, run)
+        except Exception as e:
+            print(f"[DABHound] Conversion of {link} failed: {e}")
+            return {"link": link, "status": "failed", "error": str(e), "tracks": 0, "matched": 0, "added": 0,
+                    "library_id": None, "library_name": None}
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="dabhound-batch") as pool:
+        futures = [pool.submit(convert, link) for link in links]
+        for fut in as_completed(futures):
+            done += 1
+            s = fut.result()
+            print(f"[DABHound] Batch ({done}/{len(links)}): {s['link']}: {s['status']}, "
+                  f"{s['matched']}/{s['tracks']} matched, {s['added']} added")
+    return [fut.result() for fut in futures]
+
+def load_watch_sources(cfg: dict) -> list:
+    """Sources listed in WATCH_SOURCES, each with its resync interval in seconds.
+
+    Entries are links, or {"link": ..., "interval_minutes": ...} objects;
+    links without an interval use WATCH_INTERVAL_MINUTES.
+    """
+    default = cfg.get("WATCH_INTERVAL_MINUTES", 60)
+    sources = []
+    for entry in cfg.get("WATCH_SOURCES") or []:
+        if isinstance(entry, str):
+            entry = {"link": entry}
+        link = normalize_link(entry.get("link") or "")
+        if not link or any(s["link"] == link for s in sources):
+            continue
+        sources.append({"link": link, "interval": float(entry.get("interval_minutes", default)) * 60})
+    return sources
+
+def run_watch(sources: list, run: RunContext):
+    """Resync ``sources`` until interrupted, each on its own interval.
+
+    Sources sync one at a time through the run's shared login, transport
+    and rate limiter, and their first syncs are spread over the shortest
+    interval, so many sources falling due together queue up instead of
+    bursting. Each sync is an ordinary conversion: the source's report
+    decides what is new.
+    """
+    from dabhounds.core import metrics
+    from dabhounds.core.dab import forget_lookups
+
+    spread = min(s["interval"] for s in sources) / len(sources)
+    now = time.monotonic()
+    due = [(now + i * spread, i) for i in range(len(sources))]
+    heapq.heapify(due)
+
+    while True:
+        when, i = heapq.heappop(due)
+        delay = when - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        source = sources[i]
+        started = time.monotonic()
+        print(f"[DABHound] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} Syncing {source['link']}")
+        # Remembered lookups are per sync; DAB's catalog changes between them
+        forget_lookups()
+        if run.engine:
+            run.engine.forget_lookups()
+        if metrics.has_hooks():
+            metrics.start()
+        try:
+            s = convert_link(source["link"], run)
+        except Exception as e:
+            print(f"[DABHound] Sync of {source['link']} failed: {e}")
+            s = {"status": "failed", "tracks": 0, "matched": 0, "added": 0}
+        metrics.track_counts(s["tracks"], s["matched"])
+        metrics.finish()
+
+        heapq.heappush(due, (started + source["interval"], i))
+        next_at = time.time() + max(0.0, started + source["interval"] - time.monotonic())
+        print(f"[DABHound] {source['link']}: {s['status']}, {s['matched']}/{s['tracks']} matched, "
+              f"{s['added']} added. Next sync at {datetime.fromtimestamp(next_at).strftime('%H:%M:%S')}")
+
+def drain_on_interrupt(run: RunContext):
+    """A SIGINT handler: the first Ctrl+C drains the run, the second stops it at once."""
+    def handler(signum, frame):
+        if run.stopping.is_set():
+            raise KeyboardInterrupt
+        run.stopping.set()
+        print("\n[DABHound] Stopping: finishing the tracks in flight and queued library adds "
+              "(Ctrl+C again to stop now)...")
+    return handler
+
+def print_batch_summary(summaries: list):
+    print(f"\n{'status':<12} {'matched':>9} {'added':>6}  link")
+    for s in summaries:
+        print(f"{s['status']:<12} {s['matched']:>4}/{s['tracks']:<4} {s['added']:>6}  {s['link']}")
+    print(f"[DABHound] {sum(s['matched'] for s in summaries)}/{sum(s['tracks'] for s in summaries)} tracks "
+          f"matched across {len(summaries)} links")
 
-    # === REPORT WRITING (TXT + JSON) ===
-    if append_mode and existing_report:
-        append_tracks_to_report(
-            link,
-            tracks_to_process,
-            library_id=library_id,
-            library_name=library_name,
-            matching_mode=match_mode
-        )
+def main():
+    parser = argparse.ArgumentParser(description="DABHounds: Convert Spotify or YouTube to DAB libraries")
+    parser.add_argument("link", nargs="?", help="Spotify/YouTube/ISRC input, or 'watch' to resync WATCH_SOURCES")
+    parser.add_argument("--mode", choices=["strict","lenient","manual"], default=None)
+    parser.add_argument("--version", action="store_true")
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--login", action="store_true")
+    parser.add_argument("--logout", action="store_true")
+    parser.add_argument("--spotify-login", action="store_true")
+    parser.add_argument("--credits", action="store_true")
+    parser.add_argument("--threshold", type=int, help="Override fuzzy threshold 0-100")
+    parser.add_argument("--workers", type=int, help="Match tracks on N concurrent workers (shared DAB rate limit)")
+    parser.add_argument("--engine", choices=["sync", "async"], default=None,
+                        help="I/O engine for DAB calls (async needs aiohttp)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk lookup cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached lookups but store fresh results")
+    parser.add_argument("--metrics", metavar="FILE", help="Write per-stage timings and request stats as JSON")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace-event timeline of the run")
+    parser.add_argument("--batch", metavar="FILE", help="Convert every link listed in FILE (- for stdin)")
+    parser.add_argument("--parallel", type=int, help="Links a batch converts at once (default: BATCH_PARALLEL)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted conversion without repeating its searches or library adds")
+    parser.add_argument("--export-report", action="store_true",
+                        help="Write the TXT/JSON report of <link> (or of every stored report) and exit")
+    args = parser.parse_args()
+
+    # The only place the config file is created or upgraded with new defaults
+    cfg = ensure_config()
+
+    if len(sys.argv) == 1:
+        show_main_menu()
+        sys.exit(0)
+
+    if args.credits:
+        show_credits()
+        sys.exit(0)
+
+    if args.version or args.update:
+        from dabhounds.core.version_check import FETCH_TIMEOUT, start_check
+        start_check()
+
+    if args.version:
+        print(f"DABHounds v{load_version()}")
+        check_latest_version(load_version(), wait=FETCH_TIMEOUT)
+        sys.exit(0)
+
+    if args.update:
+        check_latest_version(load_version(), wait=FETCH_TIMEOUT)
+        confirm = input("This will upgrade DABHounds via pip. Continue? (y/N): ").strip().lower()
+        if confirm == "y":
+            perform_update()
+        sys.exit(0)
+
+    if args.logout:
+        logout()
+        sys.exit(0)
+
+    if args.login:
+        email = input("Email: ").strip()
+        password = input("Password: ").strip()
+        login(email, password)
+        sys.exit(0)
+
+    if args.spotify_login:
+        from dabhounds.core.spotify_auth import get_spotify_client
+        sp = get_spotify_client()
+        print(f"[DABHound] Spotify login successful as: {sp.current_user()['display_name']}")
+        sys.exit(0)
+
+    if args.export_report:
+        from dabhounds.core.report import export_report
+        from dabhounds.core.report_store import sources
+        links = [normalize_link(args.link)] if args.link else sources()
+        if not links:
+            print("[DABHound] No reports stored yet")
+        for link in links:
+            paths = export_report(link)
+            if paths:
+                print(f"[DABHound] Exported report for {link} to {paths[0]} and {paths[1]}")
+            else:
+                print(f"[DABHound] No report stored for {link}")
+                sys.exit(1)
+        sys.exit(0)
+
+    watch = args.link == "watch"
+    if watch:
+        sources = load_watch_sources(cfg)
+        if not sources:
+            print(f"[DABHound] Nothing to watch; list links under WATCH_SOURCES in {CONFIG_FILE}")
+            sys.exit(1)
+        if (args.mode or cfg.get("MATCH_MODE", "lenient")) == "manual":
+            print("[DABHound] Manual mode is interactive; watch with --mode strict or lenient.")
+            sys.exit(1)
+        print(f"[DABHound] Watching {len(sources)} sources")
+    elif args.batch:
+        if args.link:
+            parser.error("give either a link or --batch, not both")
+        links = read_batch_links(args.batch)
+        if not links:
+            print("[DABHound] No links to convert")
+            sys.exit(1)
+        print(f"[DABHound] Batch of {len(links)} links")
+    elif args.link:
+        # strip input URL and remove tracking parameters
+        links = [normalize_link(args.link)]
+        print(f"[DABHound] Input URL: {links[0]}")
     else:
-        generate_report(
-            tracks_to_process,
-            matched_tracks,
-            match_results,
-            match_mode,
-            library_name,
-            library_id,
-            source_url=link
-        )
+        parser.print_help()
+        sys.exit(1)
 
-    print(f"[DABHound] Conversion complete. Reports written for {len(matched_tracks)} tracks.")
+    from dabhounds.core import metrics, trace
+
+    if watch:
+        # Hooks get one metrics dict per sync instead (see run_watch)
+        if args.metrics or args.trace:
+            print("[DABHound] --metrics and --trace cover one-off runs; ignoring them while watching.")
+    else:
+        if args.metrics or metrics.has_hooks():
+            metrics.start()
+        if args.trace:
+            trace.start()
+
+    parallel = 1
+    if args.batch:
+        parallel = max(1, min(args.parallel or cfg.get("BATCH_PARALLEL", 4), len(links)))
+        if (args.mode or cfg.get("MATCH_MODE", "lenient")) == "manual" and parallel > 1:
+            print("[DABHound] Manual mode is interactive; converting one link at a time.")
+            parallel = 1
+
+    try:
+        run = RunContext(args, cfg, parallel=parallel)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    if watch:
+        run.verbose = False
+        run.show_report = False
+        # A sync that failed halfway is picked up by the next one
+        run.resume = True
+        try:
+            run_watch(sources, run)
+        except KeyboardInterrupt:
+            print("\n[DABHound] Stopped watching.")
+        finally:
+            run.close()
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, drain_on_interrupt(run))
+    try:
+        if args.batch:
+            if parallel > 1:
+                run.verbose = False
+            run.show_report = False
+            summaries = run_batch(links, run, parallel)
+        else:
+            summaries = [convert_link(links[0], run)]
+    except KeyboardInterrupt:
+        print("\n[DABHound] Stopped. Progress so far is saved; continue with --resume.")
+        sys.exit(130)
+    finally:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        run.close()
+
+    finish_metrics(args, sum(s["tracks"] for s in summaries), sum(s["matched"] for s in summaries))
+
+    if args.batch:
+        from dabhounds.core.report import write_batch_summary
+        txt_path, json_path = write_batch_summary(summaries)
+        print_batch_summary(summaries)
+        print(f"[DABHound] Saved batch summary to {txt_path} and {json_path}")
+
+    if run.stopping.is_set():
+        sys.exit(130)
+    if any(s["status"] in ("unsupported", "empty", "failed") for s in summaries):
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,296 @@
+# dabhounds/core/async_engine.py
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from dabhounds.core import match_store, metrics, trace
+from dabhounds.core.auth import USER_AGENT
+from dabhounds.core.cache import get_cache, get_cache_mode
+from dabhounds.core.journal import track_key
+from dabhounds.core.dab import (
+    API_BASE, CONFIG, extract_search_results, match_key, observe_results, search_cache_key,
+    select_fuzzy_result, select_isrc_result, select_local_result,
+)
+from dabhounds.core.http import emit_request
+from dabhounds.core.library import transform_track_for_dab
+from dabhounds.core.musicbrainz import resolve_track_metadata
+from dabhounds.core.qobuz import get_qobuz_ids_for_isrc
+from dabhounds.core.ratelimit import DAB_LIMITER, MAX_THROTTLE_RETRIES, THROTTLED, retry_after_seconds
+from dabhounds.core.singleflight import AsyncSingleFlight
+
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 15
+# Marks the end of the track stream in match_tracks()
+_END = object()
+
+
+class AsyncEngine:
+    """Runs DAB I/O for a conversion on a single asyncio event loop.
+
+    The loop lives in one background thread, so the synchronous CLI can drive
+    it with ``run(coro)``. DAB requests go through one aiohttp session with
+    bounded concurrency and draw from the same token bucket as the sync path.
+    Everything else that blocks (Qobuz and MusicBrainz lookups, SQLite stores,
+    fuzzy scoring, result callbacks) runs on a small shared executor so it
+    overlaps with DAB searches instead of stalling the loop.
+    """
+
+    def __init__(self, token: str, concurrency: int = DEFAULT_CONCURRENCY):
+        if not HAS_AIOHTTP:
+            raise RuntimeError("[DABHound] The async engine needs aiohttp: pip install 'dabhounds[async]'")
+        self.token = token
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dabhound-meta")
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="dabhound-async", daemon=True)
+        self._thread.start()
+        self.run(self._open())
+
+    # ------------------------------------------------------------------
+    # Loop management
+    # ------------------------------------------------------------------
+    def run(self, coro):
+        """Run a coroutine on the engine's loop and wait for its result.
+
+        Ctrl-C in the calling thread cancels the coroutine (and every request
+        it is awaiting) before re-raising.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+            raise
+
+    async def _open(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._searches = AsyncSingleFlight()
+        self._matches = AsyncSingleFlight()
+        self.session = aiohttp.ClientSession(
+            headers={"User-Agent": CONFIG.get("USER_AGENT", USER_AGENT), "Accept": "application/json"},
+            cookies={"session": self.token} if self.token else None,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            connector=aiohttp.TCPConnector(limit=self.concurrency, ssl=False),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+
+    def forget_lookups(self):
+        """Forget the searches and matches remembered so far (see dab.forget_lookups)."""
+        self.loop.call_soon_threadsafe(self._searches.clear)
+        self.loop.call_soon_threadsafe(self._matches.clear)
+
+    def close(self):
+        try:
+            self.run(self.session.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _in_executor(self, fn, *args):
+        return await self.loop.run_in_executor(self._executor, fn, *args)
+
+    async def _request(self, method: str, path: str, **kwargs):
+        """Rate-limited DAB request. Returns (status, parsed JSON or None, headers).
+
+        Like the sync transport, every status is reported to DAB_LIMITER and
+        429/503 responses are queued again behind it.
+        """
+        async with self._semaphore:
+            for attempt in range(MAX_THROTTLE_RETRIES + 1):
+                wait = DAB_LIMITER.reserve()
+                if wait:
+                    with trace.span("ratelimit.wait", "ratelimit"):
+                        await asyncio.sleep(wait)
+                status, data, headers = await self._send(method, path, **kwargs)
+                DAB_LIMITER.on_response(status, retry_after_seconds(headers.get("Retry-After")))
+                if status not in THROTTLED or attempt == MAX_THROTTLE_RETRIES:
+                    return status, data, headers
+
+    async def _send(self, method: str, path: str, **kwargs):
+        started, t0, status = time.time(), time.perf_counter(), 0
+        try:
+            async with self.session.request(method, f"{API_BASE}{path}", **kwargs) as resp:
+                status = resp.status
+                try:
+                    data = await resp.json(content_type=None)
+                except ValueError:
+                    data = None
+                return resp.status, data, resp.headers
+        finally:
+            emit_request(method, path, status, started, time.perf_counter() - t0)
+
+    # ------------------------------------------------------------------
+    # DAB API
+    # ------------------------------------------------------------------
+    async def search(self, query: str, search_type: str = "track") -> List[Dict]:
+        """Async counterpart of dab.search_dab(), sharing its on-disk cache."""
+        cache = get_cache("dab_search")
+        cache_key = search_cache_key(query, search_type)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return await self._searches.do(cache_key, self._fetch_search, query, search_type) or []
+
+    async def _fetch_search(self, query: str, search_type: str) -> Optional[List[Dict]]:
+        try:
+            status, data, _ = await self._request("GET", "/search", params={"q": query, "type": search_type})
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        if status >= 400 or data is None:
+            return None
+
+        results = extract_search_results(data)
+        await self._in_executor(self._store_search, search_cache_key(query, search_type), results)
+        return results
+
+    @staticmethod
+    def _store_search(cache_key: str, results: List[Dict]):
+        get_cache("dab_search").set(cache_key, results)
+        observe_results(results)
+
+    async def library_exists(self, library_id: str) -> bool:
+        try:
+            status, _, _ = await self._request("GET", f"/libraries/{library_id}")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+        return status == 200
+
+    async def create_library(self, name: str, description: str = "", is_public: bool = True) -> str:
+        payload = {"name": name, "description": description, "isPublic": is_public}
+        status, data, _ = await self._request("POST", "/libraries", json=payload)
+        if status >= 400 or not data:
+            raise RuntimeError(f"[DABHound] Failed to create library (HTTP {status})")
+        return data["library"]["id"]
+
+    async def post_track(self, library_id: str, track: Dict) -> Tuple[int, Optional[float]]:
+        """POST one track. Same contract as library._post_track, for LibraryWriter."""
+        payload = {"track": transform_track_for_dab(track)}
+        try:
+            status, _, headers = await self._request("POST", f"/libraries/{library_id}/tracks", json=payload)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return 0, None
+        return status, retry_after_seconds(headers.get("Retry-After"))
+
+    # ------------------------------------------------------------------
+    # Matching (mirrors dab.match_track)
+    # ------------------------------------------------------------------
+    async def _search_by_isrc(self, isrc: str) -> Optional[Dict]:
+        results = await self.search(isrc)
+        if not results:
+            return None
+        qobuz_ids = await self._in_executor(get_qobuz_ids_for_isrc, isrc)
+        return select_isrc_result(results, qobuz_ids)
+
+    async def _match_fuzzy(self, track: Dict, threshold: int) -> Tuple[Optional[Dict], float]:
+        meta = await self._in_executor(
+            resolve_track_metadata, track.get("title"), track.get("artist"), track.get("isrc")
+        ) or track
+        local, score = await self._in_executor(select_local_result, meta)
+        if local:
+            return local, score
+        search_query = f"{meta['artist']} {meta['title']}"
+        results = await self.search(search_query)
+        if not results:
+            return None, 0.0
+        return await self._in_executor(select_fuzzy_result, meta, results, threshold)
+
+    async def _match_from_store(self, track: Dict, mode: str, threshold: int) -> Optional[Dict]:
+        entry = await self._in_executor(match_store.lookup, track, mode, threshold)
+        if not entry:
+            return None
+        if not entry["partial"]:
+            return entry["track"]
+        known_id = str(entry["track"]["id"])
+        query = track.get("isrc") or f"{track.get('artist', '')} {track.get('title', '')}"
+        for candidate in await self.search(query):
+            if str(candidate.get("id")) == known_id:
+                await self._in_executor(match_store.record, track, candidate, entry["method"],
+                                        entry["score"], entry["threshold"])
+                return candidate
+        return None
+
+    async def match_track(self, track: Dict, mode: str, threshold: int) -> Optional[Dict]:
+        if mode not in ("strict", "lenient"):
+            raise ValueError(f"[DABHound] The async engine does not support match mode: {mode}")
+
+        # metrics.stage() must not be held across an await, so time the match explicitly
+        t0 = metrics.stage_begin()
+        try:
+            result, method = await self._matches.do(match_key(track, mode, threshold),
+                                                     self._match_track, track, mode, threshold)
+        finally:
+            metrics.stage_end("match", t0, track=f"{track.get('artist', '')} - {track.get('title', '')}")
+        metrics.incr(f"match.{method if result else 'unmatched'}")
+        return result
+
+    async def _match_track(self, track: Dict, mode: str, threshold: int) -> Tuple[Optional[Dict], str]:
+        use_store = CONFIG.get("MATCH_STORE_ENABLED", True)
+        if use_store and get_cache_mode() == "use":
+            result = await self._match_from_store(track, mode, threshold)
+            if result:
+                return result, "store"
+
+        result = await self._search_by_isrc(track["isrc"]) if track.get("isrc") else None
+        method, score = "isrc", None
+        if not result and mode == "lenient":
+            result, score = await self._match_fuzzy(track, threshold)
+            method = "fuzzy"
+
+        if result and use_store:
+            await self._in_executor(match_store.record, track, result, method, score,
+                                    threshold if method == "fuzzy" else None)
+        return result, method
+
+    async def match_tracks(self, tracks: Iterable[Dict], mode: str, threshold: int,
+                           on_result: Callable[[int, Dict, Optional[Dict]], None],
+                           replay: Optional[Dict[str, Optional[Dict]]] = None) -> None:
+        """Match tracks concurrently; on_result(idx, track, result) fires in playlist order.
+
+        ``tracks`` may be a lazy stream (see core/streaming.py). It is drawn
+        on a worker thread, so waiting for the next track never blocks the
+        loop, and at most ``concurrency * 4`` tracks are in flight at once.
+        on_result runs on the executor, one call at a time.
+        Tracks whose journal.track_key() is in ``replay`` get that result
+        without a lookup.
+        """
+        loop = asyncio.get_running_loop()
+        source = iter(tracks)
+        window = self.concurrency * 4
+        pending = deque()
+        replay = replay or {}
+        try:
+            idx = 0
+            while True:
+                track = await loop.run_in_executor(None, next, source, _END)
+                if track is _END:
+                    break
+                idx += 1
+                key = track_key(track) if replay else None
+                if key in replay:
+                    task = loop.create_future()
+                    task.set_result(replay[key])
+                else:
+                    task = asyncio.ensure_future(self.match_track(track, mode, threshold))
+                pending.append((idx, track, task))
+                if len(pending) >= window:
+                    i, t, task = pending.popleft()
+                    await self._in_executor(on_result, i, t, await task)
+            while pending:
+                i, t, task = pending.popleft()
+                await self._in_executor(on_result, i, t, await task)
+        except BaseException:
+            for _, _, task in pending:
+                task.cancel()
+            raise
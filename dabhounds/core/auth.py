@@ -1,8 +1,15 @@
 # dabhounds/core/auth.py  
   
-import requests  
+import copy  
 import json  
+import os  
+import tempfile  
+import threading  
 from pathlib import Path  
+from typing import TYPE_CHECKING  
+  
+if TYPE_CHECKING:  
+    import requests  
   
 MASTER_CONFIG = {  
     "SPOTIPY_CLIENT_ID": "440ca0fe7cc54e91af9b50972e783552",  
@@ -11,6 +18,18 @@ MASTER_CONFIG = {
     "DAB_API_BASE": "https://dabmusic.xyz/api",  # updated endpoint  
     "MATCH_MODE": "lenient",  
     "FUZZY_THRESHOLD": 80,  
+    "WORKERS": 1,  
+    "ENGINE": "sync",  
+    "FETCH_QUEUE_SIZE": 256,  
+    "BATCH_PARALLEL": 4,  
+    "WATCH_SOURCES": [],  
+    "WATCH_INTERVAL_MINUTES": 60,  
+    "CACHE_ENABLED": True,  
+    "CACHE_TTL_HOURS": 168,  
+    "CACHE_MAX_ENTRIES": 100000,  
+    "CACHE_MEMORY_ENTRIES": 4096,  
+    "MATCH_STORE_ENABLED": True,  
+    "CATALOG_INDEX_ENABLED": True,  
     "SPOTIFY_TOKEN_INFO": None,
     "SHOW_TUI_OUTPUT": True,
     "TUI_FALLBACK_TO_TERMINAL": True
@@ -25,10 +44,15 @@ USER_AGENT = (
     "Chrome/1337.0.0.0 Safari/537.36"  
 )  
   
-# Disable SSL warnings globally (optional)  
-requests.packages.urllib3.disable_warnings(  
-    requests.packages.urllib3.exceptions.InsecureRequestWarning  
-)  
+  
+def _requests():  
+    """Import requests on first use; it is slow to import and most commands never need it."""  
+    import requests  
+    # Disable SSL warnings globally (optional)  
+    requests.packages.urllib3.disable_warnings(  
+        requests.packages.urllib3.exceptions.InsecureRequestWarning  
+    )  
+    return requests  
   
   
 def deep_merge(defaults: dict, user: dict) -> tuple[dict, bool]:  
@@ -45,44 +69,88 @@ def deep_merge(defaults: dict, user: dict) -> tuple[dict, bool]:
     return user, updated  
   
   
-def ensure_config() -> dict:  
-    """Create config.json if missing, merge defaults if outdated."""  
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)  
+_CONFIG: dict = {}  
+_CONFIG_STATE = {"mtime": None, "text": None}  
+_CONFIG_LOCK = threading.RLock()  
   
-    if not CONFIG_FILE.exists():  
-        with CONFIG_FILE.open("w", encoding="utf-8") as f:  
-            json.dump(MASTER_CONFIG, f, indent=2)  
-        print(f"[DABHound] Generated default config at {CONFIG_FILE}")  
-        return MASTER_CONFIG.copy()  
   
-    with CONFIG_FILE.open("r", encoding="utf-8") as f:  
-        config = json.load(f)  
+def _merged(user: dict) -> dict:  
+    merged, _ = deep_merge(copy.deepcopy(MASTER_CONFIG), user)  
+    # Force-update critical fields like API base  
+    merged["DAB_API_BASE"] = MASTER_CONFIG["DAB_API_BASE"]  
+    return merged  
   
-    merged, updated = deep_merge(MASTER_CONFIG, config)  
   
-    # Force-update critical fields like API base  
-    if merged.get("DAB_API_BASE") != MASTER_CONFIG["DAB_API_BASE"]:  
-        merged["DAB_API_BASE"] = MASTER_CONFIG["DAB_API_BASE"]  
-        updated = True  
+def _config_mtime():  
+    try:  
+        return CONFIG_FILE.stat().st_mtime_ns  
+    except FileNotFoundError:  
+        return None  
   
-    if updated:  
-        with CONFIG_FILE.open("w", encoding="utf-8") as f:  
-            json.dump(merged, f, indent=2)  
   
-    return merged  
+def _write_config_file(text: str):  
+    """Replace config.json atomically, so concurrent runs never see a half-written file."""  
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)  
+    fd, tmp = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".config-", suffix=".json")  
+    try:  
+        with os.fdopen(fd, "w", encoding="utf-8") as f:  
+            f.write(text)  
+        os.replace(tmp, CONFIG_FILE)  
+    except BaseException:  
+        if os.path.exists(tmp):  
+            os.remove(tmp)  
+        raise  
   
   
 def load_config() -> dict:  
-    return ensure_config()  
+    """Return the process-wide config, merged with defaults.  
+  
+    The file is only re-read when its mtime changes, and never written here.  
+    The same dict is returned on every call (and refreshed in place), so  
+    modules may keep a reference to it; persist changes with save_config().  
+    """  
+    with _CONFIG_LOCK:  
+        mtime = _config_mtime()  
+        if _CONFIG and mtime == _CONFIG_STATE["mtime"]:  
+            return _CONFIG  
+  
+        user, text = {}, None  
+        if mtime is not None:  
+            with CONFIG_FILE.open("r", encoding="utf-8") as f:  
+                text = f.read()  
+            user = json.loads(text)  
+        _CONFIG.clear()  
+        _CONFIG.update(_merged(user))  
+        _CONFIG_STATE.update(mtime=mtime, text=text)  
+        return _CONFIG  
   
   
 def save_config(cfg: dict):  
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)  
-    with CONFIG_FILE.open("w", encoding="utf-8") as f:  
-        json.dump(cfg, f, indent=2)  
+    """Write the config if (and only if) it differs from what is on disk."""  
+    with _CONFIG_LOCK:  
+        text = json.dumps(cfg, indent=2)  
+        if _config_mtime() == _CONFIG_STATE["mtime"] and text == _CONFIG_STATE["text"]:  
+            return  
+        _write_config_file(text)  
+        merged = _merged(json.loads(text))  
+        _CONFIG.clear()  
+        _CONFIG.update(merged)  
+        _CONFIG_STATE.update(mtime=_config_mtime(), text=text)  
+  
+  
+def ensure_config() -> dict:  
+    """Create config.json if missing, merge defaults if outdated."""  
+    with _CONFIG_LOCK:  
+        existed = CONFIG_FILE.exists()  
+        config = load_config()  
+        save_config(config)  
+        if not existed:  
+            print(f"[DABHound] Generated default config at {CONFIG_FILE}")  
+        return config  
   
   
 def verify_token(token: str) -> bool:  
+    requests = _requests()  
     headers = {  
         "Authorization": f"Bearer {token}",  
         "User-Agent": USER_AGENT  
@@ -100,6 +168,7 @@ def verify_token(token: str) -> bool:
   
 def login(email: str, password: str) -> str | None:  
     print("[DABHound] Logging in to DAB...")  
+    requests = _requests()  
     session = requests.Session()  
     headers = {  
         "User-Agent": USER_AGENT,  
@@ -157,13 +226,12 @@ def ensure_logged_in() -> str:
         exit(1)  
   
   
-def get_authenticated_session() -> requests.Session:  
-    token = ensure_logged_in()  
-    session = requests.Session()  
-    session.cookies.set("session", token)  
-    session.headers.update({"User-Agent": USER_AGENT})  
-    session.verify = False  
-    return session  
+def get_authenticated_session() -> "requests.Session":  
+    """The shared, logged-in DAB session (see core/http.py)."""  
+    from dabhounds.core.http import get_transport  
+    transport = get_transport()  
+    transport.authenticate()  
+    return transport.session  
   
   
 def logout():  
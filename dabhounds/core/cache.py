@@ -0,0 +1,182 @@
+# dabhounds/core/cache.py
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from dabhounds.core.auth import CONFIG_DIR, load_config
+from dabhounds.core.db import Database
+
+CACHE_DIR = CONFIG_DIR / "cache"
+CACHE_DB = CACHE_DIR / "cache.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_age ON entries (namespace, created_at);
+"""
+
+# Cache modes:
+#   "use"     - read and write (default)
+#   "refresh" - ignore stored entries but store fresh responses
+#   "off"     - bypass the cache entirely
+CACHE_MODES = ("use", "refresh", "off")
+_MODE = "use"
+
+_DB: Optional[Database] = None
+_DB_LOCK = threading.Lock()
+_CACHES: Dict[str, "Cache"] = {}
+
+# How often (in writes) to check a namespace against its size limit
+_EVICT_EVERY = 256
+
+
+def set_cache_mode(mode: str):
+    global _MODE
+    if mode not in CACHE_MODES:
+        raise ValueError(f"[DABHound] Unknown cache mode: {mode}")
+    _MODE = mode
+
+
+def get_cache_mode() -> str:
+    return _MODE
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a free-text query so trivially different spellings share one entry."""
+    return re.sub(r"\s+", " ", (query or "").casefold()).strip()
+
+
+def _get_db() -> Database:
+    global _DB
+    with _DB_LOCK:
+        if _DB is None:
+            _DB = Database(CACHE_DB, SCHEMA)
+        return _DB
+
+
+class Cache:
+    """Persistent key/value cache for one namespace, with an in-memory LRU in front.
+
+    Values must be JSON-serializable. ``None`` is never cached, so ``get()``
+    returning ``None`` always means "miss".
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, max_entries: int, memory_entries: int):
+        self.namespace = namespace
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        if _MODE != "use":
+            return None
+        now = time.time()
+
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None:
+                expires_at, value = hit
+                if expires_at > now:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._lru[key]
+
+        try:
+            rows = _get_db().query(
+                "SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+        except sqlite3.Error:
+            rows = None
+        if not rows or rows[0]["created_at"] + self.ttl <= now:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        value = json.loads(rows[0]["value"])
+        self._remember(key, value, rows[0]["created_at"] + self.ttl)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        if _MODE == "off" or value is None:
+            return
+        now = time.time()
+        self._remember(key, value, now + self.ttl)
+
+        try:
+            db = _get_db()
+            db.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now),
+            )
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._lru[key] = (expires_at, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.memory_entries:
+                self._lru.popitem(last=False)
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until the namespace fits its size limit."""
+        db = _get_db()
+        db.execute(
+            "DELETE FROM entries WHERE namespace = ? AND created_at <= ?",
+            (self.namespace, time.time() - self.ttl),
+        )
+        count = db.query("SELECT COUNT(*) AS n FROM entries WHERE namespace = ?", (self.namespace,))[0]["n"]
+        excess = count - self.max_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM entries WHERE rowid IN ("
+                "SELECT rowid FROM entries WHERE namespace = ? ORDER BY created_at LIMIT ?)",
+                (self.namespace, excess),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        _get_db().execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+
+def cache_stats() -> Dict[str, tuple]:
+    """(hits, misses) of every cache namespace used in this process so far."""
+    return {namespace: (cache.hits, cache.misses) for namespace, cache in list(_CACHES.items())}
+
+
+def get_cache(namespace: str, ttl_hours: Optional[float] = None) -> Cache:
+    """Return the process-wide cache for a namespace, configured from config.json."""
+    cache = _CACHES.get(namespace)
+    if cache is None:
+        cfg = load_config()
+        ttl = ttl_hours if ttl_hours is not None else cfg.get("CACHE_TTL_HOURS", 168)
+        cache = _CACHES.setdefault(namespace, Cache(
+            namespace,
+            ttl_seconds=float(ttl) * 3600,
+            max_entries=int(cfg.get("CACHE_MAX_ENTRIES", 100000)),
+            memory_entries=int(cfg.get("CACHE_MEMORY_ENTRIES", 4096)),
+        ))
+    return cache
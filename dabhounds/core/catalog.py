@@ -0,0 +1,114 @@
+# dabhounds/core/catalog.py
+
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from dabhounds.core.auth import CONFIG_DIR
+from dabhounds.core.db import Database
+from dabhounds.core.scoring import normalize_text
+
+# Every DAB track seen in a search response, indexed for offline candidate lookup
+CATALOG_DB = CONFIG_DIR / "catalog.sqlite3"
+# Let SQLite read the index through a memory map instead of read() calls
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id TEXT PRIMARY KEY,
+    isrc TEXT,
+    album_id TEXT,
+    data TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracks_isrc ON tracks (isrc);
+CREATE INDEX IF NOT EXISTS tracks_album ON tracks (album_id);
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    PRIMARY KEY (token, track_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tokens_track ON tokens (track_id);
+"""
+
+# Share of the wanted artist/title tokens a track must contain to be a candidate
+MIN_TOKEN_OVERLAP = 0.6
+MAX_CANDIDATES = 50
+
+_DB: Optional[Database] = None
+_DB_LOCK = threading.Lock()
+
+
+def _get_db() -> Database:
+    global _DB
+    with _DB_LOCK:
+        if _DB is None:
+            _DB = Database(CATALOG_DB, SCHEMA)
+            _DB.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return _DB
+
+
+def _tokens(*texts: str) -> List[str]:
+    return sorted({tok for text in texts for tok in normalize_text(text or "").split()})
+
+
+def observe(results: Iterable[Dict]):
+    """Add (or refresh) every track of a DAB search response in the index."""
+    now = time.time()
+    track_rows, token_rows = [], []
+    for track in results:
+        if not isinstance(track, dict) or track.get("id") is None:
+            continue
+        track_id = str(track["id"])
+        isrc = (track.get("isrc") or "").strip().upper() or None
+        album_id = str(track["albumId"]) if track.get("albumId") else None
+        track_rows.append((track_id, isrc, album_id, json.dumps(track), now))
+        token_rows.extend((tok, track_id) for tok in _tokens(track.get("artist"), track.get("title")))
+    if not track_rows:
+        return
+
+    db = _get_db()
+    with db.lock:
+        # A track's artist/title can change; drop its old postings first
+        db.conn.executemany("DELETE FROM tokens WHERE track_id = ?", [(row[0],) for row in track_rows])
+        db.conn.executemany(
+            "INSERT OR REPLACE INTO tracks (id, isrc, album_id, data, seen_at) VALUES (?, ?, ?, ?, ?)",
+            track_rows,
+        )
+        db.conn.executemany("INSERT OR IGNORE INTO tokens (token, track_id) VALUES (?, ?)", token_rows)
+        db.conn.commit()
+
+
+def by_isrc(isrc: str) -> List[Dict]:
+    rows = _get_db().query("SELECT data FROM tracks WHERE isrc = ?", ((isrc or "").strip().upper(),))
+    return [json.loads(row["data"]) for row in rows]
+
+
+def candidates(artist: str, title: str, isrc: Optional[str] = None,
+               limit: int = MAX_CANDIDATES) -> List[Dict]:
+    """Known tracks sharing most of the artist/title tokens (plus any with the ISRC).
+
+    Tracks are ranked by how many tokens they share; scoring them is left to
+    the caller, exactly as with a search response.
+    """
+    found: Dict[str, Dict] = {}
+    if isrc:
+        for track in by_isrc(isrc):
+            found[str(track["id"])] = track
+
+    wanted = _tokens(artist, title)
+    if wanted:
+        need = max(1, round(len(wanted) * MIN_TOKEN_OVERLAP))
+        rows = _get_db().query(
+            f"""
+            SELECT t.id, t.data FROM tokens k JOIN tracks t ON t.id = k.track_id
+            WHERE k.token IN ({','.join('?' * len(wanted))})
+            GROUP BY k.track_id HAVING COUNT(*) >= ?
+            ORDER BY COUNT(*) DESC LIMIT ?
+            """,
+            (*wanted, need, limit),
+        )
+        for row in rows:
+            found.setdefault(row["id"], json.loads(row["data"]))
+    return list(found.values())
@@ -1,13 +1,17 @@
 # dabhounds/core/dab.py
 
-import time
-from typing import Optional, List, Dict
-from rapidfuzz import fuzz
+from typing import Optional, List, Dict, Tuple
 import requests
 
 from dabhounds.core.auth import load_config
+from dabhounds.core.http import get_transport
 from dabhounds.core.qobuz import get_qobuz_ids_for_isrc
 from dabhounds.core.musicbrainz import resolve_track_metadata
+from dabhounds.core.ratelimit import THROTTLED
+from dabhounds.core.scoring import EXACT_SCORE, best_candidate, best_exact_candidate
+from dabhounds.core.singleflight import SingleFlight
+from dabhounds.core.cache import get_cache, get_cache_mode, normalize_query
+from dabhounds.core import catalog, match_store, metrics
 
 CONFIG = load_config()
 API_BASE = CONFIG["DAB_API_BASE"]
@@ -17,16 +21,10 @@ requests.packages.urllib3.disable_warnings(
     requests.packages.urllib3.exceptions.InsecureRequestWarning
 )
 
-# --- Rate limiting ---
-_LAST_REQUEST_TIME = 0
-_MIN_INTERVAL = 10 / 15  # ~0.6667 seconds/request
-
-def _throttle():
-    global _LAST_REQUEST_TIME
-    elapsed = time.time() - _LAST_REQUEST_TIME
-    if elapsed < _MIN_INTERVAL:
-        time.sleep(_MIN_INTERVAL - elapsed)
-    _LAST_REQUEST_TIME = time.time()
+# Duplicate searches within a run (repeated tracks, chapters) share one request
+_SEARCHES = SingleFlight()
+# A track repeated within a playlist, or across the playlists of a batch, is matched once
+_MATCHES = SingleFlight()
 
 # --- Utility: build headers and cookies ---
 def _build_headers_and_cookies(token: str):
@@ -61,51 +59,83 @@ def _build_headers_and_cookies(token: str):
 
 
 # --- Core API calls ---
-def search_dab(query: str, token: str = None) -> List[Dict]:
+def search_dab(query: str, token: str = None, search_type: str = "track") -> List[Dict]:
     """Search DAB for tracks matching the query.
 
     This function mirrors the original dabcli behavior:
       - Sends Cookie: session=<token> when available in config (DAB_AUTH_TOKEN).
       - Sends the configured User-Agent.
       - Does NOT add an Authorization: Bearer header by default, to match earlier traces.
+
+    Requests go through the shared keep-alive transport (core/http.py).
+    Successful responses are cached on disk (see core/cache.py), keyed on the
+    normalized query and search type; failed requests are never cached.
+    Identical searches within a run share one request (see core/singleflight.py).
     """
-    _throttle()
+    cache = get_cache("dab_search")
+    cache_key = search_cache_key(query, search_type)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # Prefer explicit token argument, otherwise fall back to stored config token
-    session_token = token or CONFIG.get("DAB_AUTH_TOKEN") or ""
+    return _SEARCHES.do(cache_key, _fetch_search, query, token, search_type) or []
 
-    headers = {
-        "User-Agent": CONFIG.get(
-            "USER_AGENT",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/1337.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-    }
 
-    # Build cookies exactly as the original CLI: cookie name 'session'
-    cookies = {}
-    if session_token:
-        cookies["session"] = session_token
+def _fetch_search(query: str, token: Optional[str], search_type: str) -> Optional[List[Dict]]:
+    """One DAB search on the shared transport (which re-queues 429/503). Returns None on failure."""
+    # Prefer explicit token argument, otherwise fall back to stored config token
+    transport = get_transport()
+    transport.set_token(token or CONFIG.get("DAB_AUTH_TOKEN"))
 
     try:
-        resp = requests.get(
-            f"{API_BASE}/search",
-            params={"q": query, "type": "track"},
-            headers=headers,
-            cookies=cookies or None,
-            verify=False,
-            timeout=15,
-        )
+        resp = transport.get("/search", params={"q": query, "type": search_type})
+        if resp.status_code in THROTTLED:
+            print(f"[DABHound] DAB kept rate limiting the search for '{query}'; skipping it.")
         resp.raise_for_status()
         data = resp.json()
-        # keep compatible with either {"tracks": [...]} or a raw list
-        if isinstance(data, dict) and "tracks" in data:
-            return data["tracks"]
-        return data if isinstance(data, list) else []
-    except requests.RequestException:
-        return []
+    except (requests.RequestException, ValueError):
+        return None
+
+    results = extract_search_results(data)
+    get_cache("dab_search").set(search_cache_key(query, search_type), results)
+    observe_results(results)
+    return results
+
+
+def observe_results(results: List[Dict]):
+    """Feed a fresh search response into the local catalog index."""
+    if CONFIG.get("CATALOG_INDEX_ENABLED", True) and get_cache_mode() != "off":
+        catalog.observe(results)
+
+
+def select_local_result(meta: Dict) -> Tuple[Optional[Dict], float]:
+    """Answer a fuzzy lookup from the local catalog index, if it holds the exact track.
+
+    The index only holds part of the catalog, so a fuzzy score is not
+    enough to skip the search: only a known track with the same normalized
+    artist and title and a matching duration is taken. Returns (result,
+    score) like select_fuzzy_result().
+    """
+    if not CONFIG.get("CATALOG_INDEX_ENABLED", True) or get_cache_mode() != "use":
+        return None, 0.0
+    local = catalog.candidates(meta.get("artist") or "", meta.get("title") or "", meta.get("isrc"))
+    result = best_exact_candidate(meta.get("artist") or "", meta.get("title") or "", local,
+                                  meta.get("duration_ms"), require_duration=True)
+    if not result:
+        return None, 0.0
+    metrics.incr("catalog.local_hits")
+    return result, EXACT_SCORE
+
+
+def search_cache_key(query: str, search_type: str = "track") -> str:
+    return f"{search_type}:{normalize_query(query)}"
+
+
+def extract_search_results(data) -> List[Dict]:
+    # keep compatible with either {"tracks": [...]} or a raw list
+    if isinstance(data, dict) and "tracks" in data:
+        return data["tracks"]
+    return data if isinstance(data, list) else []
 
 def find_best_quality_track(tracks: List[Dict]) -> Optional[Dict]:
     """Select the track with the highest sample rate / bit depth."""
@@ -119,18 +149,21 @@ def find_best_quality_track(tracks: List[Dict]) -> Optional[Dict]:
     return sorted(tracks, key=get_quality, reverse=True)[0]
 
 
+def select_isrc_result(results: List[Dict], qobuz_ids: List) -> Optional[Dict]:
+    """Prefer results whose ID Qobuz confirms for the ISRC, then the best quality."""
+    if qobuz_ids:
+        filtered = [t for t in results if t["id"] in qobuz_ids]
+        return find_best_quality_track(filtered or results)
+    return find_best_quality_track(results)
+
+
 def search_dab_by_isrc(isrc: str, token: str) -> Optional[Dict]:
     """Search by ISRC, optionally filtering by Qobuz IDs."""
     results = search_dab(isrc, token)
     if not results:
         return None
 
-    qobuz_ids = get_qobuz_ids_for_isrc(isrc)
-    if qobuz_ids:
-        filtered = [t for t in results if t["id"] in qobuz_ids]
-        return find_best_quality_track(filtered or results)
-
-    return find_best_quality_track(results)
+    return select_isrc_result(results, get_qobuz_ids_for_isrc(isrc))
 
 
 # --- Matching modes ---
@@ -140,40 +173,39 @@ def match_strict(isrc: str, token: str) -> Optional[Dict]:
     return search_dab_by_isrc(isrc, token)
 
 
-def match_track_lenient(track: Dict, token: str, threshold: int) -> Optional[Dict]:
-    """Lenient matching using ISRC first, then fuzzy title/artist search."""
-    isrc = track.get("isrc")
+def _match_fuzzy(track: Dict, token: str, threshold: int) -> Tuple[Optional[Dict], float]:
+    """Steps 2-3 of lenient matching: refine metadata, then fuzzy-filter a text search.
+
+    Returns (result, score); the score is kept in the match store.
+    """
     title = track.get("title")
     artist = track.get("artist")
 
-    # Step 1 — ISRC match
-    if isrc:
-        result = search_dab_by_isrc(isrc, token)
-        if result:
-            return result
-
     # Step 2 — Metadata refinement
-    meta = resolve_track_metadata(title, artist) or track
-    search_query = f"{meta['artist']} {meta['title']}"
+    meta = resolve_track_metadata(title, artist, track.get("isrc")) or track
 
-    # Step 3 — Search and fuzzy filter
+    # Step 3 — Tracks seen in earlier searches, then search and fuzzy filter
+    local, score = select_local_result(meta)
+    if local:
+        return local, score
+
+    search_query = f"{meta['artist']} {meta['title']}"
     results = search_dab(search_query, token)
     if not results:
-        return None
+        return None, 0.0
 
-    best_score = 0
-    best_match = None
-    for candidate in results:
-        candidate_str = f"{candidate['artist']} {candidate['title']}"
-        score = fuzz.token_set_ratio(search_query, candidate_str)
-        if score > best_score:
-            best_score = score
-            best_match = candidate
+    return select_fuzzy_result(meta, results, threshold)
 
-    if best_match and best_score >= threshold:
-        return best_match
 
-    return None
+def select_fuzzy_result(meta: Dict, results: List[Dict], threshold: int) -> Tuple[Optional[Dict], float]:
+    """Pick the candidate closest to meta's artist/title (and duration), if it clears the threshold.
+
+    Returns (result, score), or (None, 0.0) when nothing clears it.
+    """
+    with metrics.stage("fuzzy.score"):
+        best = best_candidate(meta.get("artist") or "", meta.get("title") or "", results, threshold,
+                              duration_ms=meta.get("duration_ms"))
+    return (best[1], best[0]) if best else (None, 0.0)
 
 
 def match_manual(title: str, artist: str, token: str) -> Optional[Dict]:
@@ -205,13 +237,76 @@ def match_manual(title: str, artist: str, token: str) -> Optional[Dict]:
         print("[DABHound] Invalid input.")
 
 
+def _match_from_store(track: Dict, mode: str, token: str, threshold: int) -> Optional[Dict]:
+    """Answer a track from the global match store, if it has been matched before."""
+    entry = match_store.lookup(track, mode, threshold)
+    if not entry:
+        return None
+    if not entry["partial"]:
+        return entry["track"]
+
+    # Partial entries only know the DAB ID: find the full track dict with a
+    # single search, skipping Qobuz, MusicBrainz and fuzzy scoring.
+    known_id = str(entry["track"]["id"])
+    query = track.get("isrc") or f"{track.get('artist', '')} {track.get('title', '')}"
+    for candidate in search_dab(query, token):
+        if str(candidate.get("id")) == known_id:
+            match_store.record(track, candidate, entry["method"], entry["score"], entry["threshold"])
+            return candidate
+    return None
+
+
 def match_track(track: Dict, mode: str, token: str, threshold: int) -> Optional[Dict]:
-    """General entry point for track matching."""
+    """General entry point for track matching.
+
+    Tracks already matched in any earlier run (by Spotify ID, YouTube ID or
+    ISRC) are answered from the global match store before searching.
+    """
+    if mode not in ("strict", "lenient", "manual"):
+        raise ValueError(f"[DABHound] Unknown match mode: {mode}")
+
+    with metrics.stage("match", track=f"{track.get('artist', '')} - {track.get('title', '')}"):
+        if mode == "manual":
+            result, method = _match_track(track, mode, token, threshold)
+        else:
+            result, method = _MATCHES.do(match_key(track, mode, threshold), _match_track, track, mode, token, threshold)
+    metrics.incr(f"match.{method if result else 'unmatched'}")
+    return result
+
+
+def forget_lookups():
+    """Forget the searches and matches remembered so far, so the next ones are looked up again."""
+    _SEARCHES.clear()
+    _MATCHES.clear()
+
+
+def match_key(track: Dict, mode: str, threshold: int) -> tuple:
+    """Tracks with equal keys get the same match, so one lookup answers them all."""
+    return (mode, threshold, tuple(match_store.source_keys(track)), track.get("artist"), track.get("title"),
+            track.get("duration_ms"))
+
+
+def _match_track(track: Dict, mode: str, token: str, threshold: int):
+    """match_track() without the bookkeeping. Returns (result, method)."""
+    use_store = CONFIG.get("MATCH_STORE_ENABLED", True)
+    if use_store and mode != "manual" and get_cache_mode() == "use":
+        result = _match_from_store(track, mode, token, threshold)
+        if result:
+            return result, "store"
+
+    method, score = mode, None
     if mode == "strict":
-        return match_strict(track.get("isrc"), token)
+        result = match_strict(track.get("isrc"), token)
+        method = "isrc"
     elif mode == "lenient":
-        return match_track_lenient(track, token, threshold)
-    elif mode == "manual":
-        return match_manual(track.get("title"), track.get("artist"), token)
+        result = match_strict(track.get("isrc"), token)
+        method = "isrc"
+        if not result:
+            result, score = _match_fuzzy(track, token, threshold)
+            method = "fuzzy"
     else:
-        raise ValueError(f"[DABHound] Unknown match mode: {mode}")
+        result = match_manual(track.get("title"), track.get("artist"), token)
+
+    if result and use_store:
+        match_store.record(track, result, method, score, threshold if method == "fuzzy" else None)
+    return result, method
@@ -0,0 +1,48 @@
+# dabhounds/core/db.py
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from dabhounds.core.auth import CONFIG_DIR
+
+# Long-lived state (match store, ledgers) shared by all runs; caches live elsewhere
+STATE_DB = CONFIG_DIR / "state.sqlite3"
+
+
+class Database:
+    """A single SQLite connection shared between threads, guarded by a lock."""
+
+    def __init__(self, path: Path, schema: str = ""):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock:
+            # WAL lets concurrent dabhounds processes read while one writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            if schema:
+                self.conn.executescript(schema)
+            self.conn.commit()
+
+    def execute(self, sql: str, params=()):
+        with self.lock:
+            cur = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cur
+
+    def executemany(self, sql: str, rows):
+        with self.lock:
+            cur = self.conn.executemany(sql, rows)
+            self.conn.commit()
+            return cur
+
+    def query(self, sql: str, params=()) -> list:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,133 @@
+# dabhounds/core/http.py
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from dabhounds.core.auth import USER_AGENT, ensure_logged_in, load_config
+from dabhounds.core.ratelimit import DAB_LIMITER, MAX_THROTTLE_RETRIES, THROTTLED, retry_after_seconds
+
+CONFIG = load_config()
+API_BASE = CONFIG["DAB_API_BASE"]
+
+DEFAULT_TIMEOUT = 15
+# Connections kept open to DAB; raised to the worker count by configure()
+DEFAULT_POOL_SIZE = 4
+
+# Callables receiving one dict per finished DAB request:
+#   {"method", "path", "status" (0 on network error), "started", "elapsed"}
+# Both the sync transport and the async engine report here.
+_HOOKS: List[Callable[[Dict], None]] = []
+
+
+def add_request_hook(hook: Callable[[Dict], None]):
+    _HOOKS.append(hook)
+
+
+def remove_request_hook(hook: Callable[[Dict], None]):
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def emit_request(method: str, path: str, status: int, started: float, elapsed: float):
+    event = {"method": method, "path": path, "status": status, "started": started, "elapsed": elapsed}
+    for hook in list(_HOOKS):
+        hook(event)
+
+
+class DabTransport:
+    """One keep-alive requests.Session for every DAB call in the process.
+
+    Connections are pooled and reused across searches, library checks and
+    track writes; headers and the session cookie are set once. Responses
+    are decoded from gzip/deflate, and brotli when the optional ``brotli``
+    package is installed (urllib3 advertises only what it can decode).
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": CONFIG.get("USER_AGENT", USER_AGENT),
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        })
+        self.session.verify = False
+        self.pool_size = 0
+        self.configure(pool_size)
+        self._token: Optional[str] = None
+        self._token_lock = threading.Lock()
+
+    def configure(self, pool_size: int):
+        """Grow the connection pool (e.g. to the number of workers)."""
+        if pool_size <= self.pool_size:
+            return
+        self.pool_size = pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def set_token(self, token: Optional[str]):
+        with self._token_lock:
+            if token and token != self._token:
+                self._token = token
+                self.session.cookies.set("session", token)
+
+    def authenticate(self) -> str:
+        """Make sure the session cookie is set, logging in at most once per process."""
+        with self._token_lock:
+            token = self._token
+        if not token:
+            self.set_token(ensure_logged_in())
+        return self._token
+
+    def request(self, method: str, path: str, authenticated: bool = False, **kwargs) -> requests.Response:
+        """Send a rate-limited request to ``API_BASE + path``.
+
+        Every attempt takes a token from DAB_LIMITER and reports its status
+        back to it. Throttled responses (429/503) are queued again behind the
+        limiter, up to MAX_THROTTLE_RETRIES times, instead of being returned.
+        Network errors propagate as requests exceptions.
+        """
+        if authenticated:
+            self.authenticate()
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            DAB_LIMITER.acquire()
+            response = self._send(method, path, **kwargs)
+            DAB_LIMITER.on_response(response.status_code, retry_after_seconds(response.headers.get("Retry-After")))
+            if response.status_code not in THROTTLED or attempt == MAX_THROTTLE_RETRIES:
+                return response
+            response.close()
+
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        started = time.time()
+        t0 = time.perf_counter()
+        status = 0
+        try:
+            response = self.session.request(method, f"{API_BASE}{path}", **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            emit_request(method, path, status, started, time.perf_counter() - t0)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+
+_TRANSPORT: Optional[DabTransport] = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_transport() -> DabTransport:
+    global _TRANSPORT
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is None:
+            _TRANSPORT = DabTransport(max(DEFAULT_POOL_SIZE, CONFIG.get("WORKERS", 1)))
+        return _TRANSPORT
@@ -0,0 +1,99 @@
+# dabhounds/core/journal.py
+
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+from dabhounds.core.db import Database, STATE_DB
+from dabhounds.core.match_store import source_keys
+
+# One row per conversion in progress, cleared once its report is written.
+# Library adds are journaled by the library ledger (see core/library.py).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_runs (
+    source_url TEXT PRIMARY KEY,
+    matching_mode TEXT NOT NULL,
+    threshold INTEGER,
+    library_id TEXT,
+    library_name TEXT,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal_matches (
+    source_url TEXT NOT NULL,
+    track_key TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (source_url, track_key)
+);
+"""
+
+_DB: Optional[Database] = None
+_DB_LOCK = threading.Lock()
+
+
+def _get_db() -> Database:
+    global _DB
+    with _DB_LOCK:
+        if _DB is None:
+            _DB = Database(STATE_DB, SCHEMA)
+        return _DB
+
+
+def track_key(track: Dict) -> str:
+    """The key a source track's match is journaled under."""
+    keys = source_keys(track)
+    return keys[0] if keys else f"{track.get('artist', '')} - {track.get('title', '')}"
+
+
+def get(source_url: str) -> Optional[Dict]:
+    """The journaled conversion of a source (mode, threshold, library), or None."""
+    rows = _get_db().query("SELECT * FROM journal_runs WHERE source_url = ?", (source_url,))
+    if not rows:
+        return None
+    row = rows[0]
+    return {key: row[key] for key in ("matching_mode", "threshold", "library_id", "library_name", "started_at")}
+
+
+def begin(source_url: str, mode: str, threshold: int, library_id: Optional[str] = None,
+          library_name: Optional[str] = None):
+    """Start journaling a conversion, dropping any earlier journal of the source."""
+    db = _get_db()
+    now = time.time()
+    with db.lock, db.conn:
+        db.conn.execute("DELETE FROM journal_matches WHERE source_url = ?", (source_url,))
+        db.conn.execute(
+            "INSERT OR REPLACE INTO journal_runs "
+            "(source_url, matching_mode, threshold, library_id, library_name, started_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (source_url, mode, threshold, library_id, library_name, now, now),
+        )
+
+
+def set_library(source_url: str, library_id: str, library_name: str):
+    """Remember the library a conversion created, so a resume adds to it instead of making another."""
+    _get_db().execute(
+        "UPDATE journal_runs SET library_id = ?, library_name = ?, updated_at = ? WHERE source_url = ?",
+        (library_id, library_name, time.time(), source_url),
+    )
+
+
+def record(source_url: str, track: Dict, result: Optional[Dict]):
+    """Journal one match result (None for no match); committed before returning."""
+    _get_db().execute(
+        "INSERT OR REPLACE INTO journal_matches (source_url, track_key, result) VALUES (?, ?, ?)",
+        (source_url, track_key(track), json.dumps(result) if result else None),
+    )
+
+
+def results(source_url: str) -> Dict[str, Optional[Dict]]:
+    """Every journaled match of a source, by track_key()."""
+    rows = _get_db().query("SELECT track_key, result FROM journal_matches WHERE source_url = ?", (source_url,))
+    return {row["track_key"]: json.loads(row["result"]) if row["result"] else None for row in rows}
+
+
+def clear(source_url: str):
+    db = _get_db()
+    with db.lock, db.conn:
+        db.conn.execute("DELETE FROM journal_matches WHERE source_url = ?", (source_url,))
+        db.conn.execute("DELETE FROM journal_runs WHERE source_url = ?", (source_url,))
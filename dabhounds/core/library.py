@@ -1,12 +1,34 @@
 # dabhounds/core/library.py  
   
-import requests  
-from typing import List  
-from dabhounds.core.auth import ensure_logged_in, load_config, get_authenticated_session  
+import queue  
+import threading  
 import time  
+import requests  
+from typing import Callable, List, Optional, Tuple  
+from dabhounds.core.auth import ensure_logged_in, load_config  
+from dabhounds.core.http import get_transport
+from dabhounds.core.db import Database, STATE_DB  
+from dabhounds.core import metrics
+from dabhounds.core.ratelimit import THROTTLED, retry_after_seconds
   
 CONFIG = load_config()  
 API_BASE = CONFIG["DAB_API_BASE"]  
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # seconds; doubled on each retry
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS library_tracks (
+    library_id TEXT NOT NULL,
+    dab_track_id TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    PRIMARY KEY (library_id, dab_track_id)
+);
+"""
+
+_STOP = object()
+_LEDGER: Optional[Database] = None
+_LEDGER_LOCK = threading.Lock()
   
 def get_headers():  
     token = ensure_logged_in()  
@@ -20,9 +42,8 @@ def get_headers():
 
 def library_exists(library_id: str) -> bool:
     """Check if a DAB library with this ID still exists."""
-    session = get_authenticated_session()
     try:
-        response = session.get(f"{API_BASE}/libraries/{library_id}")
+        response = get_transport().get(f"/libraries/{library_id}", authenticated=True)
         if response.status_code == 200:
             return True
         if response.status_code == 404:
@@ -33,16 +54,58 @@ def library_exists(library_id: str) -> bool:
         return False
 
 def create_library(name: str, description: str = "", is_public: bool = True) -> str:  
-    session = get_authenticated_session()  
     payload = {  
         "name": name,  
         "description": description,  
         "isPublic": is_public  
     }  
-    response = session.post(f"{API_BASE}/libraries", json=payload)  
+    response = get_transport().post("/libraries", json=payload, authenticated=True)  
     response.raise_for_status()  
     return response.json()["library"]["id"]  
   
+# --- Ledger of tracks already added to each library ---
+def _ledger() -> Database:
+    global _LEDGER
+    with _LEDGER_LOCK:
+        if _LEDGER is None:
+            _LEDGER = Database(STATE_DB, LEDGER_SCHEMA)
+        return _LEDGER
+
+
+def is_in_library(library_id: str, dab_track_id: str) -> bool:
+    rows = _ledger().query(
+        "SELECT 1 FROM library_tracks WHERE library_id = ? AND dab_track_id = ?",
+        (str(library_id), str(dab_track_id)),
+    )
+    return bool(rows)
+
+
+def record_in_library(library_id: str, dab_track_id: str):
+    _ledger().execute(
+        "INSERT OR IGNORE INTO library_tracks (library_id, dab_track_id, added_at) VALUES (?, ?, ?)",
+        (str(library_id), str(dab_track_id), time.time()),
+    )
+
+
+def _is_transient(status: int) -> bool:
+    # 0 = connection error / timeout. Throttled responses are retried by the
+    # transport (up to MAX_THROTTLE_RETRIES); one that comes back here is final.
+    return status == 0 or (status >= 500 and status not in THROTTLED)
+
+
+def _post_track(library_id: str, track: dict) -> Tuple[int, Optional[float]]:
+    """POST one track. Returns (HTTP status or 0 on network error, Retry-After seconds)."""
+    try:
+        response = get_transport().post(
+            f"/libraries/{library_id}/tracks",
+            json={"track": transform_track_for_dab(track)},
+            authenticated=True,
+        )
+    except requests.RequestException:
+        return 0, None
+    return response.status_code, retry_after_seconds(response.headers.get("Retry-After"))
+
+
 # --- NEW: transform track to API expected format ---  
 def transform_track_for_dab(track: dict) -> dict:
     dab = track.get("full_track", {})
@@ -63,20 +126,92 @@ def transform_track_for_dab(track: dict) -> dict:
         ),
     }
   
-def add_tracks_to_library(library_id: str, tracks: List[dict]) -> None:  
-    session = get_authenticated_session()  
-    min_interval = 10 / 15  # ~0.6667 seconds per request  
-    last_request = 0  
-  
-    for track in tracks:  
-        payload = {"track": transform_track_for_dab(track)}  
-  
-        elapsed = time.time() - last_request  
-        if elapsed < min_interval:  
-            time.sleep(min_interval - elapsed)  
-  
-        response = session.post(f"{API_BASE}/libraries/{library_id}/tracks", json=payload)  
-        last_request = time.time()  
-  
-        if not response.ok:  
-            print(f"[DABHound] Warning: Failed to add {track['title']} - {track['artist']}")
\ No newline at end of file
+class LibraryWriter:
+    """Adds matched tracks to a DAB library in the background, while matching continues.
+
+    Tracks are posted in the order they are submitted. Unmatched entries (no
+    dab_track_id) are skipped. Network errors and 5xx are retried with
+    exponential backoff; 429/503 are already retried by the transport behind
+    the adaptive limiter, so one that still comes back is final. Every
+    successful add is recorded in a ledger so the same track is never added
+    to a library twice, even across runs.
+
+    If no library_id is given, ``create()`` is called to make the library when
+    the first matched track arrives, so runs without matches create nothing.
+    """
+
+    def __init__(self, library_id: Optional[str] = None, create: Optional[Callable[[], str]] = None,
+                 post: Optional[Callable[[str, dict], Tuple[int, Optional[float]]]] = None):
+        self.library_id = library_id
+        self._create = create
+        self._post = post or _post_track
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="dabhound-library", daemon=True)
+        self._error: Optional[BaseException] = None
+        self.added = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def start(self) -> "LibraryWriter":
+        self._thread.start()
+        return self
+
+    def submit(self, track: dict):
+        if self._error:
+            raise self._error
+        if track.get("dab_track_id") is None:
+            self.skipped += 1
+            return
+        self._queue.put(track)
+
+    def close(self) -> Optional[str]:
+        """Wait for queued tracks to be written. Returns the library ID (None if never created)."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self.library_id
+
+    def _run(self):
+        while True:
+            track = self._queue.get()
+            if track is _STOP:
+                return
+            if self._error:
+                continue
+            try:
+                if self.library_id is None:
+                    self.library_id = self._create()
+                    print(f"[DABHound] Library created. ID: {self.library_id}")
+                with metrics.stage("library.write", track_id=track["dab_track_id"]):
+                    self._write(track)
+            except BaseException as e:
+                # Stop writing; submit()/close() re-raise this in the caller's thread
+                self._error = e
+
+    def _write(self, track: dict):
+        track_id = str(track["dab_track_id"])
+        if is_in_library(self.library_id, track_id):
+            self.skipped += 1
+            return
+
+        for attempt in range(MAX_RETRIES + 1):
+            status, retry_after = self._post(self.library_id, track)
+            if 200 <= status < 300:
+                record_in_library(self.library_id, track_id)
+                self.added += 1
+                return
+            if not _is_transient(status) or attempt == MAX_RETRIES:
+                break
+            time.sleep(BACKOFF_BASE * 2 ** attempt)
+
+        self.failed += 1
+        print(f"[DABHound] Warning: Failed to add {track['title']} - {track['artist']}")
+
+
+def add_tracks_to_library(library_id: str, tracks: List[dict]) -> None:
+    """Add tracks to a library and wait; unmatched and already-added tracks are skipped."""
+    writer = LibraryWriter(library_id).start()
+    for track in tracks:
+        writer.submit(track)
+    writer.close()
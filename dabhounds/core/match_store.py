@@ -0,0 +1,159 @@
+# dabhounds/core/match_store.py
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from dabhounds.core import report_store
+from dabhounds.core.db import Database, STATE_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    key TEXT PRIMARY KEY,
+    dab_track_id TEXT NOT NULL,
+    track TEXT NOT NULL,
+    method TEXT NOT NULL,
+    partial INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    score REAL,
+    threshold REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# How a stored match was made. Strict mode only trusts ISRC-backed matches.
+TRUSTED_METHODS = {
+    "strict": {"isrc"},
+    "lenient": {"isrc", "fuzzy", "manual", "report"},
+}
+# Matches that were accepted on a fuzzy score; they are only reused when that
+# score clears the current run's threshold. Report imports carry no score and
+# are trusted in lenient mode, as resyncs always trusted their own report.
+SCORED_METHODS = {"fuzzy"}
+
+_DB: Optional[Database] = None
+_DB_LOCK = threading.Lock()
+
+
+def _get_db() -> Database:
+    global _DB
+    with _DB_LOCK:
+        if _DB is None:
+            _DB = Database(STATE_DB, SCHEMA)
+            _add_columns(_DB)
+            bootstrap_from_reports(_DB)
+        return _DB
+
+
+def _add_columns(db: Database):
+    """Add the score columns to a matches table created before they existed."""
+    columns = {row["name"] for row in db.query("PRAGMA table_info(matches)")}
+    for column in ("score", "threshold"):
+        if column not in columns:
+            db.execute(f"ALTER TABLE matches ADD COLUMN {column} REAL")
+
+
+def source_keys(track: Dict) -> List[str]:
+    """All global keys a source track can be found under, most specific first."""
+    keys = []
+    if track.get("spotify_id"):
+        keys.append(f"spotify:{track['spotify_id']}")
+    yt_id = track.get("youtube_id") or track.get("yt_id")
+    if yt_id:
+        # Chapters of one video share its ID, so the chapter offset is part of the key
+        keys.append(f"yt:{yt_id}:{track.get('chapter_start_sec') or 0}")
+    if track.get("isrc"):
+        keys.append(f"isrc:{track['isrc'].strip().upper()}")
+    return keys
+
+
+def lookup(track: Dict, mode: str, threshold: int) -> Optional[Dict]:
+    """Return the stored match for a track, or None.
+
+    The result is ``{"track": <DAB track dict>, "partial": bool, "method": str,
+    "score": float or None, "threshold": float or None}``. Partial entries
+    only carry the DAB ID (e.g. they were imported from a report) and should
+    be re-resolved before use. Fuzzy entries are skipped unless the score
+    they were accepted at clears ``threshold``; fuzzy entries stored before
+    scores were kept never do.
+    """
+    trusted = TRUSTED_METHODS.get(mode)
+    keys = source_keys(track)
+    if not trusted or not keys:
+        return None
+
+    db = _get_db()
+    rows = db.query(
+        f"SELECT key, track, method, partial, score, threshold FROM matches "
+        f"WHERE key IN ({','.join('?' * len(keys))})",
+        keys,
+    )
+    by_key = {row["key"]: row for row in rows}
+    for key in keys:
+        row = by_key.get(key)
+        if not row or row["method"] not in trusted:
+            continue
+        if row["method"] in SCORED_METHODS and (row["score"] is None or row["score"] < threshold):
+            continue
+        return {"track": json.loads(row["track"]), "partial": bool(row["partial"]), "method": row["method"],
+                "score": row["score"], "threshold": row["threshold"]}
+    return None
+
+
+def record(track: Dict, result: Dict, method: str, score: Optional[float] = None,
+           threshold: Optional[float] = None):
+    """Remember a match under every source key of the track.
+
+    Fuzzy matches pass the score they were accepted at and the threshold it
+    had to clear.
+    """
+    keys = source_keys(track)
+    if not keys or not result or result.get("id") is None:
+        return
+    now = time.time()
+    payload = json.dumps(result)
+    _get_db().executemany(
+        "INSERT OR REPLACE INTO matches (key, dab_track_id, track, method, partial, updated_at, score, threshold) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(key, str(result["id"]), payload, method, 0, now, score, threshold) for key in keys],
+    )
+
+
+def bootstrap_from_reports(db: Database):
+    """Import FOUND tracks from reports stored or updated since the last import.
+
+    Reports only keep the DAB ID, the source artist/title and the ISRC, so the
+    imported entries are partial and keyed by ISRC. Existing complete entries
+    are never overwritten.
+    """
+    rows = db.query("SELECT value FROM meta WHERE name = 'reports_imported_at'")
+    last_import = float(rows[0]["value"]) if rows else 0.0
+    started = time.time()
+
+    entries = []
+    for source_url in report_store.sources(updated_since=last_import):
+        report = report_store.get(source_url) or {}
+        method = "isrc" if report.get("matching_mode") == "strict" else "report"
+        for t in report_store.tracks(source_url):
+            if not t.get("dab_track_id") or not t.get("isrc"):
+                continue
+            partial_track = {"id": t["dab_track_id"], "artist": t.get("artist"), "title": t.get("title")}
+            entries.append((
+                f"isrc:{t['isrc'].strip().upper()}", str(t["dab_track_id"]),
+                json.dumps(partial_track), method, 1, started,
+            ))
+
+    if entries:
+        db.executemany(
+            "INSERT OR IGNORE INTO matches (key, dab_track_id, track, method, partial, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            entries,
+        )
+    db.execute(
+        "INSERT OR REPLACE INTO meta (name, value) VALUES ('reports_imported_at', ?)",
+        (str(started),),
+    )
@@ -0,0 +1,283 @@
+# dabhounds/core/metrics.py
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from dabhounds.core import trace
+
+# Upper bounds (ms) of the request latency histogram buckets; slower requests land in "+inf"
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Stages spent waiting on the user (the report viewer); left out of wall_s and tracks/sec
+INTERACTIVE_STAGES = ("report.display",)
+
+_LIBRARY_ID_RE = re.compile(r"/libraries/[^/]+")
+
+
+class _Timing:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class _RequestStats(_Timing):
+    __slots__ = ("errors", "statuses", "buckets")
+
+    def __init__(self):
+        super().__init__()
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float, status: Optional[int], error: bool):
+        self.add(seconds)
+        if error:
+            self.errors += 1
+        if status is not None:
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        ms = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict:
+        out = super().to_dict()
+        out["errors"] = self.errors
+        out["statuses"] = dict(sorted(self.statuses.items()))
+        labels = [str(b) for b in LATENCY_BUCKETS_MS] + ["+inf"]
+        out["histogram_ms"] = dict(zip(labels, self.buckets))
+        return out
+
+
+class Metrics:
+    """Counters and timings for one conversion.
+
+    ``stages`` hold busy time per activity, summed over every thread (so
+    overlapping work can add up to more than the wall time); stages named
+    "run.*" are the CLI's sequential phases. ``requests`` hold per-endpoint
+    counts, statuses and latency histograms for every service. Time spent
+    in INTERACTIVE_STAGES is not counted in ``wall_s``.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: Dict[str, _Timing] = {}
+        self.requests: Dict[str, Dict[str, _RequestStats]] = {}
+        self.counters: Dict[str, int] = {}
+        self.tracks = {"total": 0, "matched": 0}
+        self._limiter_base = _limiter_waits()
+        self._cache_base = _cache_counts()
+
+    def add_stage(self, name: str, seconds: float):
+        with self._lock:
+            timing = self.stages.get(name)
+            if timing is None:
+                timing = self.stages[name] = _Timing()
+            timing.add(seconds)
+
+    def add_request(self, service: str, endpoint: str, seconds: float,
+                    status: Optional[int] = None, error: bool = False):
+        with self._lock:
+            endpoints = self.requests.setdefault(service, {})
+            stats = endpoints.get(endpoint)
+            if stats is None:
+                stats = endpoints[endpoint] = _RequestStats()
+            stats.record(seconds, status, error)
+            timing = self.stages.get(service)
+            if timing is None:
+                timing = self.stages[service] = _Timing()
+            timing.add(seconds)
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict:
+        wall = time.perf_counter() - self._t0
+        with self._lock:
+            stages = {name: t.to_dict() for name, t in sorted(self.stages.items())}
+            requests = {
+                service: {endpoint: s.to_dict() for endpoint, s in sorted(endpoints.items())}
+                for service, endpoints in sorted(self.requests.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+            wall -= sum(self.stages[name].total for name in INTERACTIVE_STAGES if name in self.stages)
+
+        waits = _limiter_waits()
+        rate_limiter = {
+            name: {"wait_s": round(wait - self._limiter_base.get(name, 0.0), 4)}
+            for name, wait in waits.items()
+        }
+        cache = {}
+        for namespace, (hits, misses) in _cache_counts().items():
+            base_hits, base_misses = self._cache_base.get(namespace, (0, 0))
+            hits, misses = hits - base_hits, misses - base_misses
+            if hits or misses:
+                cache[namespace] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 4)}
+
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": round(wall, 4),
+            "tracks": dict(self.tracks, per_second=round(self.tracks["total"] / wall, 3) if wall else 0.0),
+            "stages": stages,
+            "requests": requests,
+            "rate_limiter": rate_limiter,
+            "cache": cache,
+            "counters": counters,
+        }
+
+
+def _limiter_waits() -> Dict[str, float]:
+    from dabhounds.core.ratelimit import LIMITERS
+    return {name: limiter.waited for name, limiter in LIMITERS.items()}
+
+
+def _cache_counts() -> Dict[str, tuple]:
+    from dabhounds.core.cache import cache_stats
+    return cache_stats()
+
+
+# --- The metrics of the conversion in progress (None when not measuring) ---
+
+_ACTIVE: Optional[Metrics] = None
+_HOOKS: List[Callable[[Dict], None]] = []
+
+
+def add_metrics_hook(hook: Callable[[Dict], None]):
+    """Call ``hook(metrics_dict)`` at the end of every measured conversion."""
+    _HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook: Callable[[Dict], None]):
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def has_hooks() -> bool:
+    return bool(_HOOKS)
+
+
+def _on_dab_request(event: Dict):
+    m = _ACTIVE
+    if m is not None:
+        endpoint = f"{event['method']} {_LIBRARY_ID_RE.sub('/libraries/{id}', event['path'])}"
+        m.add_request("dab", endpoint, event["elapsed"], event["status"] or None, error=not event["status"])
+
+
+def start() -> Metrics:
+    """Begin measuring a conversion."""
+    global _ACTIVE
+    from dabhounds.core.http import add_request_hook
+    _ACTIVE = Metrics()
+    add_request_hook(_on_dab_request)
+    return _ACTIVE
+
+
+def finish() -> Optional[Dict]:
+    """Stop measuring; returns the metrics dict (also handed to every hook)."""
+    global _ACTIVE
+    m, _ACTIVE = _ACTIVE, None
+    if m is None:
+        return None
+    from dabhounds.core.http import remove_request_hook
+    remove_request_hook(_on_dab_request)
+    data = m.to_dict()
+    for hook in list(_HOOKS):
+        hook(data)
+    return data
+
+
+def active() -> Optional[Metrics]:
+    return _ACTIVE
+
+
+def stage_begin() -> float:
+    """Start timing one occurrence of a stage; hand the result to stage_end().
+
+    For coroutines, which must not hold stage() across an await.
+    """
+    t = trace.active()
+    return t.begin() if t is not None else time.perf_counter()
+
+
+def stage_end(name: str, t0: float, **args):
+    """Record the stage begun at ``t0`` (see stage_begin)."""
+    m, t = _ACTIVE, trace.active()
+    elapsed = time.perf_counter() - t0
+    if m is not None:
+        m.add_stage(name, elapsed)
+    if t is not None:
+        t.add(name, "stage", t0, elapsed, args)
+
+
+@contextmanager
+def stage(name: str, **args):
+    """Time the enclosed block as one occurrence of ``name``.
+
+    When a trace is running the block is also a span; ``args`` only go there.
+    """
+    if _ACTIVE is None and trace.active() is None:
+        yield
+        return
+    t0 = stage_begin()
+    try:
+        yield
+    finally:
+        stage_end(name, t0, **args)
+
+
+@contextmanager
+def request(service: str, endpoint: str, **args):
+    """Time one call to a non-DAB service; an exception counts as an error."""
+    m, t = _ACTIVE, trace.active()
+    if m is None and t is None:
+        yield
+        return
+    t0 = t.begin() if t is not None else time.perf_counter()
+    error = True
+    try:
+        yield
+        error = False
+    finally:
+        elapsed = time.perf_counter() - t0
+        if m is not None:
+            m.add_request(service, endpoint, elapsed, error=error)
+        if t is not None:
+            t.add(f"{service} {endpoint}", service, t0, elapsed, dict(args, error=True) if error else args)
+
+
+def incr(name: str, n: int = 1):
+    m = _ACTIVE
+    if m is not None:
+        m.incr(name, n)
+
+
+def track_counts(total: int, matched: int):
+    m = _ACTIVE
+    if m is not None:
+        m.tracks.update(total=total, matched=matched)
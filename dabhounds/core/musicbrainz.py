@@ -1,28 +1,196 @@
 # dabhounds/core/musicbrainz.py
 
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
 import musicbrainzngs
+from rapidfuzz import fuzz
+
+from dabhounds import __version__
+from dabhounds.core.cache import get_cache, normalize_query
+from dabhounds.core import metrics
+from dabhounds.core.ratelimit import LIMITERS, TokenBucket
+from dabhounds.core.singleflight import SingleFlight
+
+musicbrainzngs.set_useragent("DABHounds", __version__, "https://github.com/sherlockholmesat221b/DABHounds")
+# musicbrainzngs' built-in limiter is not thread-safe; MB_LIMITER replaces it.
+musicbrainzngs.set_rate_limit(False)
+
+# MusicBrainz allows one request per second per client
+MB_LIMITER = TokenBucket(rate=1.0, capacity=1)
+LIMITERS["musicbrainz"] = MB_LIMITER
+MB_CACHE_TTL_HOURS = 24 * 30
+# Recordings per Lucene OR query; keeps queries short and results relevant
+BATCH_SIZE = 5
+# How close a batched result must be to count as the answer for one pair
+BATCH_MATCH_SCORE = 85
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+# Stored for lookups that found nothing, since None means "not cached"
+_NO_RESULT: Dict = {}
+# Repeated tracks within a run share one lookup
+_LOOKUPS = SingleFlight()
+
+
+def _call(fn, *args, **kwargs):
+    """Run one MusicBrainz request under the shared limiter, retrying once when throttled."""
+    for attempt in range(2):
+        MB_LIMITER.acquire()
+        try:
+            with metrics.request("musicbrainz", fn.__name__):
+                return fn(*args, **kwargs)
+        except musicbrainzngs.ResponseError as e:
+            status = getattr(getattr(e, "cause", None), "code", None)
+            if status != 503 or attempt:
+                raise
+        except musicbrainzngs.NetworkError:
+            if attempt:
+                raise
+        time.sleep(2)
+
+
+def _artist_name(rec: Dict) -> Optional[str]:
+    if rec.get("artist-credit-phrase"):
+        return rec["artist-credit-phrase"]
+    credit = rec.get("artist-credit", [{}])[0]
+    if isinstance(credit, dict):
+        return credit.get("name") or credit.get("artist", {}).get("name")
+    return None
+
+
+def _to_metadata(rec: Dict) -> Dict:
+    return {
+        "title": rec.get("title"),
+        "artist": _artist_name(rec),
+        "isrc": rec.get("isrc-list", [None])[0],
+        "duration_ms": int(rec["length"]) if "length" in rec else None
+    }
 
-musicbrainzngs.set_useragent("DABHounds", "2.1.1", "https://github.com/sherlockholmesat221b/DABHounds")
 
-def resolve_track_metadata(title: str, artist: str) -> dict | None:
-    """Attempt to resolve canonical metadata using MusicBrainz."""
+def _search_key(title: str, artist: str) -> str:
+    return f"search:{normalize_query(artist)}\x1f{normalize_query(title)}"
+
+
+def _lucene(text: str) -> str:
+    return _LUCENE_SPECIAL.sub(r"\\\1", text or "")
+
+
+def lookup_isrc(isrc: str) -> Optional[Dict]:
+    """Resolve metadata through a direct ISRC lookup (no free-text search)."""
+    return _LOOKUPS.do(("isrc", isrc.strip().upper()), _lookup_isrc, isrc) or None
+
+
+def _lookup_isrc(isrc: str) -> Optional[Dict]:
+    """Returns _NO_RESULT when MusicBrainz has no recording, None on errors."""
+    cache = get_cache("musicbrainz", ttl_hours=MB_CACHE_TTL_HOURS)
+    key = f"isrc:{isrc.strip().upper()}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        result = musicbrainzngs.search_recordings(
+        result = _call(musicbrainzngs.get_recordings_by_isrc, isrc, includes=["artists", "isrcs"])
+        recordings = result.get("isrc", {}).get("recording-list", [])
+    except musicbrainzngs.ResponseError as e:
+        if getattr(getattr(e, "cause", None), "code", None) != 404:
+            print(f"[MusicBrainz] Error looking up ISRC {isrc}: {e}")
+            return None
+        recordings = []
+    except Exception as e:
+        print(f"[MusicBrainz] Error looking up ISRC {isrc}: {e}")
+        return None
+
+    meta = _to_metadata(recordings[0]) if recordings else _NO_RESULT
+    if meta and not meta.get("isrc"):
+        meta["isrc"] = isrc
+    cache.set(key, meta)
+    return meta
+
+
+def resolve_track_metadata(title: str, artist: str, isrc: Optional[str] = None) -> dict | None:
+    """Attempt to resolve canonical metadata using MusicBrainz.
+
+    A known ISRC is looked up directly; otherwise (or if that finds nothing)
+    a free-text recording search is used. Results are cached on disk.
+    """
+    if isrc:
+        meta = lookup_isrc(isrc)
+        if meta:
+            return meta
+    return _LOOKUPS.do(("search", _search_key(title, artist)), _search_recording, title, artist) or None
+
+
+def _search_recording(title: str, artist: str) -> Optional[Dict]:
+    cache = get_cache("musicbrainz", ttl_hours=MB_CACHE_TTL_HOURS)
+    key = _search_key(title, artist)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        result = _call(
+            musicbrainzngs.search_recordings,
             recording=title,
             artist=artist,
             limit=1
         )
         recordings = result.get("recording-list", [])
-        if not recordings:
-            return None
-
-        rec = recordings[0]
-        return {
-            "title": rec.get("title"),
-            "artist": rec.get("artist-credit", [{}])[0].get("name"),
-            "isrc": rec.get("isrc-list", [None])[0],
-            "duration_ms": int(rec["length"]) if "length" in rec else None
-        }
     except Exception as e:
         print(f"[MusicBrainz] Error resolving '{artist} - {title}': {e}")
-        return None
\ No newline at end of file
+        return None
+
+    meta = _to_metadata(recordings[0]) if recordings else _NO_RESULT
+    cache.set(key, meta)
+    return meta
+
+
+def _best_for_pair(title: str, artist: str, recordings: List[Dict]) -> Optional[Dict]:
+    best, best_score = None, 0
+    for rec in recordings:
+        score = min(
+            fuzz.token_set_ratio(title.casefold(), (rec.get("title") or "").casefold()),
+            fuzz.token_set_ratio(artist.casefold(), (_artist_name(rec) or "").casefold()),
+        )
+        if score > best_score:
+            best, best_score = rec, score
+    return best if best_score >= BATCH_MATCH_SCORE else None
+
+
+def resolve_many(pairs: Sequence[Tuple[str, str]]) -> List[Optional[Dict]]:
+    """Resolve many (title, artist) pairs, batching cache misses into Lucene OR queries.
+
+    Each batch costs one request for up to BATCH_SIZE recordings. Pairs the
+    batch cannot answer confidently fall back to resolve_track_metadata().
+    """
+    cache = get_cache("musicbrainz", ttl_hours=MB_CACHE_TTL_HOURS)
+    resolved: Dict[Tuple[str, str], Dict] = {}
+    misses = []
+    for title, artist in dict.fromkeys(pairs):
+        if title and artist and cache.get(_search_key(title, artist)) is None:
+            misses.append((title, artist))
+
+    for start in range(0, len(misses), BATCH_SIZE):
+        chunk = misses[start:start + BATCH_SIZE]
+        if len(chunk) < 2:
+            break
+        query = " OR ".join(
+            f'(recording:"{_lucene(title)}" AND artist:"{_lucene(artist)}")' for title, artist in chunk
+        )
+        try:
+            result = _call(musicbrainzngs.search_recordings, query=query, limit=len(chunk) * 5)
+        except Exception as e:
+            print(f"[MusicBrainz] Batch lookup failed, resolving individually: {e}")
+            continue
+        recordings = result.get("recording-list", [])
+        for title, artist in chunk:
+            rec = _best_for_pair(title, artist, recordings)
+            if rec:
+                resolved[(title, artist)] = _to_metadata(rec)
+                cache.set(_search_key(title, artist), resolved[(title, artist)])
+
+    # Anything the batches could not answer is resolved one by one
+    return [
+        resolved.get((title, artist)) or (resolve_track_metadata(title, artist) if title and artist else None)
+        for title, artist in pairs
+    ]
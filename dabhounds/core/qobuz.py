@@ -1,25 +1,127 @@
 # dabhounds/core/qobuz.py
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from dabhounds.core import metrics
+from dabhounds.core.cache import get_cache
+from dabhounds.core.singleflight import SingleFlight
 
 QOBUZ_API = "https://www.qobuz.com/api.json/0.2/track/search"
 APP_ID = "798273057"
 
-def get_qobuz_ids_for_isrc(isrc: str):
-    """
-    Search official Qobuz API for a track by ISRC and return matching track IDs.
-    """
-    try:
+# (connect, read) timeouts in seconds
+TIMEOUT = (3.05, 10)
+POOL_SIZE = 8
+# ISRC -> Qobuz ID mappings hardly ever change
+ISRC_CACHE_TTL_HOURS = 24 * 30
+
+
+class QobuzClient:
+    """Qobuz ISRC resolver on a pooled keep-alive session, backed by the on-disk cache."""
+
+    def __init__(self, app_id: str = APP_ID, workers: int = 4):
+        self.app_id = app_id
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.cache = get_cache("qobuz_isrc", ttl_hours=ISRC_CACHE_TTL_HOURS)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dabhound-qobuz")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Repeated ISRCs within a run share one request, even with the cache off
+        self._flight = SingleFlight()
+
+    def _fetch(self, isrc: str) -> Optional[List[int]]:
+        """Query Qobuz for one ISRC. Returns None on failure so errors are never cached."""
         params = {
             "query": isrc,
             "limit": 50,  # keep the old default limit
-            "app_id": APP_ID
+            "app_id": self.app_id,
         }
-        resp = requests.get(QOBUZ_API, params=params)
-        if not resp.ok:
-            return []
+        try:
+            with metrics.request("qobuz", "track/search", isrc=isrc):
+                resp = self.session.get(QOBUZ_API, params=params, timeout=TIMEOUT)
+            if not resp.ok:
+                return None
+            data = resp.json()
+        except (requests.RequestException, ValueError):
+            return None
 
-        data = resp.json()
         tracks = data.get("tracks", {}).get("items", [])
-        return [t["id"] for t in tracks if t.get("isrc") == isrc]
-    except Exception:
-        return []
\ No newline at end of file
+        ids = [t["id"] for t in tracks if t.get("isrc") == isrc]
+        self.cache.set(isrc, ids)
+        return ids
+
+    def _submit(self, isrc: str) -> Future:
+        with self._lock:
+            fut = self._inflight.get(isrc)
+            if fut is None:
+                fut = self._executor.submit(self._fetch, isrc)
+                self._inflight[isrc] = fut
+                fut.add_done_callback(lambda _f, key=isrc: self._forget(key))
+            return fut
+
+    def _forget(self, isrc: str):
+        with self._lock:
+            self._inflight.pop(isrc, None)
+
+    def get_ids_for_isrc(self, isrc: str) -> List[int]:
+        """Return Qobuz track IDs whose ISRC matches exactly."""
+        cached = self.cache.get(isrc)
+        if cached is not None:
+            return cached
+        with self._lock:
+            fut = self._inflight.get(isrc)
+        ids = fut.result() if fut else self._flight.do(isrc, self._fetch, isrc)
+        return ids or []
+
+    def prefetch(self, isrcs: Iterable[str]) -> int:
+        """Start resolving ISRCs in the background. Returns how many were queued."""
+        queued = 0
+        for isrc in dict.fromkeys(i for i in isrcs if i):
+            if self.cache.get(isrc) is None:
+                self._submit(isrc)
+                queued += 1
+        return queued
+
+    def close(self):
+        """Drop queued prefetches (they are only an optimization) and release connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_CLIENT: Optional[QobuzClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_qobuz_client() -> QobuzClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = QobuzClient()
+        return _CLIENT
+
+
+def get_qobuz_ids_for_isrc(isrc: str):
+    """
+    Search official Qobuz API for a track by ISRC and return matching track IDs.
+    """
+    return get_qobuz_client().get_ids_for_isrc(isrc)
+
+
+def prefetch_qobuz_ids(isrcs: Iterable[str]) -> int:
+    """Warm the ISRC -> Qobuz ID cache for a whole playlist in the background."""
+    return get_qobuz_client().prefetch(isrcs)
+
+
+def close_qobuz_client():
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            _CLIENT.close()
+            _CLIENT = None
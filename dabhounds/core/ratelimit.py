@@ -0,0 +1,123 @@
+# dabhounds/core/ratelimit.py
+
+import threading
+import time
+from typing import Dict, Optional
+
+from dabhounds.core import trace
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    ``rate`` tokens are added per second, up to ``capacity``. ``acquire()``
+    reserves a token and sleeps until it is due, so several threads can share
+    one budget while their requests overlap on the wire. ``waited`` adds up
+    every delay handed out, for --metrics.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token without blocking. Returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve the token now (possibly going negative) so that waiting
+            # callers queue up behind each other instead of racing.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available. Returns seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            with trace.span("ratelimit.wait", "ratelimit"):
+                time.sleep(wait)
+        return wait
+
+
+# Statuses that mean "slow down"; the request itself should be sent again
+THROTTLED = (429, 503)
+
+
+def retry_after_seconds(value) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter(TokenBucket):
+    """Token bucket whose rate follows the server's responses (AIMD).
+
+    ``on_response()`` is fed every response status. A 429/503 multiplies the
+    rate by ``decrease`` (at most once per cooldown, so one burst of
+    rejections counts once) and, with Retry-After, holds every later
+    reservation back until that time. Each run of ``healthy_window``
+    successful (2xx/3xx) responses adds ``increase`` req/s, up to
+    ``max_rate``; errors such as 401/404 neither slow it down nor count.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: float = 0.2,
+                 max_rate: Optional[float] = None, increase: float = 0.1,
+                 decrease: float = 0.5, healthy_window: int = 10):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.decrease = decrease
+        self.healthy_window = healthy_window
+        self._healthy = 0
+        self._last_decrease = 0.0
+
+    def pause(self, seconds: float):
+        """Push the next free token at least ``seconds`` into the future."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def on_response(self, status: int, retry_after: Optional[float] = None):
+        if status in THROTTLED:
+            with self._lock:
+                now = time.monotonic()
+                self._healthy = 0
+                if now - self._last_decrease >= max(1.0, 1 / self.rate):
+                    self._refill(now)
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._last_decrease = now
+            self.pause(retry_after if retry_after is not None else 1 / self.rate)
+        elif 200 <= status < 400:
+            with self._lock:
+                self._healthy += 1
+                if self._healthy >= self.healthy_window:
+                    self._healthy = 0
+                    self._refill(time.monotonic())
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+# DAB documents 15 requests per 10 seconds. Every DAB call shares this
+# budget, which starts there, backs off on 429/503 and recovers back up to
+# (never beyond) the documented rate while DAB keeps answering normally.
+DAB_RATE = 15 / 10
+DAB_LIMITER = AdaptiveLimiter(rate=DAB_RATE, capacity=1, max_rate=DAB_RATE)
+# Times a throttled request is queued again before the caller sees the 429/503
+MAX_THROTTLE_RETRIES = 5
+
+# Every shared limiter by service, so --metrics can report time spent waiting
+LIMITERS: Dict[str, TokenBucket] = {"dab": DAB_LIMITER}
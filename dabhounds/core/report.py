@@ -5,10 +5,11 @@ import hashlib
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from dabhounds.core.tui_report import show_tui_report, show_terminal_summary
 from dabhounds.core.auth import load_config
+from dabhounds.core import metrics, report_store
 
 CONFIG_DIR = Path.home() / ".dabhound"
 REPORT_DIR = CONFIG_DIR / "reports"
@@ -17,99 +18,124 @@ REPORT_DIR.mkdir(parents=True, exist_ok=True)
 def md5_hash(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
+def source_ids(track: Dict) -> Dict:
+    """Source identifiers kept in the report so resyncs can recognise known tracks."""
+    ids = {"spotify_id": track.get("spotify_id"), "yt_id": track.get("youtube_id") or track.get("yt_id")}
+    return {key: value for key, value in ids.items() if value}
+
+def _entry(track: Dict, dab_track_id=None, dab_track: Optional[Dict] = None) -> Dict:
+    """One report entry for a source track and the DAB track it matched (if any)."""
+    return {
+        "artist": track["artist"],
+        "title": track["title"],
+        "isrc": track.get("isrc"),
+        "track_id": track.get("track_id") or f"{track['artist']} - {track['title']}",
+        "match_status": "FOUND" if dab_track_id else "NOT FOUND",
+        "dab_track_id": dab_track_id,
+        **source_ids(track),
+        "dab_artist": (dab_track or {}).get("artist"),
+        "dab_title": (dab_track or {}).get("title"),
+    }
+
 def generate_report(input_tracks: List[Dict], matched_tracks: List[Dict], match_results: List[Dict],
-                    mode: str, library_name: str, library_id: str, source_url: str):
-    """Generate both TXT (verbose) and JSON (minimal) reports using per-track unique IDs."""
+                    mode: str, library_name: str, library_id: str, source_url: str,
+                    sync_state: Optional[Dict] = None, show: bool = True):
+    """Store the report of a conversion, replacing any earlier one for the source.
+
+    Reports live in the report store, indexed by source and track ID; the
+    TXT and JSON files are written by export_report(). ``sync_state`` (e.g.
+    a Spotify playlist snapshot) is stored so the next resync can skip work
+    when the source has not changed. ``show=False`` skips the TUI/terminal
+    summary (batch runs print their own).
+    """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    # Build track data for reports
-    json_data = []
-    for i, original in enumerate(input_tracks):
-        match = match_results[i]
-        track_id = original.get("track_id") or f"{original['artist']} - {original['title']}"
-        json_data.append({
-            "artist": original["artist"],
-            "title": original["title"],
-            "isrc": original.get("isrc"),
-            "track_id": track_id,
-            "match_status": "FOUND" if match else "NOT FOUND",
-            "dab_track_id": match["id"] if match else None
-        })
-    
-    # TXT report
-    lines = [f"DABHounds Conversion Report — {timestamp}",
-             f"Source URL: {source_url}",
-             f"Matching Mode: {mode.upper()}",
-             f"DAB Library ID: {library_id}",
-             "-"*60]
-
-    for i, original in enumerate(input_tracks):
-        match = match_results[i]
-        matched = "FOUND" if match else "NOT FOUND"
-        lines.append(f"{i+1}. {original['artist']} - {original['title']}")
-        lines.append(f"    ISRC: {original.get('isrc') or 'N/A'}")
-        lines.append(f"    Match Status: {matched}")
-        if match:
-            lines.append(f"    DAB Track: {match['artist']} - {match['title']} (ID: {match['id']})")
-        else:
-            lines.append("    DAB Track: —")
-        # Include per-track ID for clarity
-        lines.append(f"    Track ID: {original.get('track_id', 'N/A')}")
-        lines.append("")
-
-    safe_name = library_name.replace(" ", "_").replace(":", "-")
-    txt_path = REPORT_DIR / f"report_{safe_name}.txt"
-    with txt_path.open("w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
-
-    # JSON report
-    json_path = REPORT_DIR / f"report_{md5_hash(source_url)}.json"
-    json_report = {
+    entries = [
+        _entry(original, match["id"] if match else None, match)
+        for original, match in zip(input_tracks, match_results)
+    ]
+    header = {
         "library_name": library_name,
         "library_id": library_id,
         "matching_mode": mode,
         "timestamp": timestamp,
         "source_url": source_url,
-        "tracks": json_data
     }
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(json_report, f, indent=2)
+    if sync_state:
+        header["spotify_snapshot"] = sync_state
+    with metrics.stage("report.write", tracks=len(entries)):
+        report_store.save(source_url, header, entries)
 
-    print(f"[DABHound] Saved report to {txt_path} and {json_path}")
+    print(f"[DABHound] Saved report for {len(entries)} tracks (export it with: dabhounds {source_url} --export-report)")
     
-    # Show TUI or terminal summary based on config
+    if show:
+        show_report([_json_entry(e) for e in entries], library_name, library_id, source_url)
+
+
+def show_report(tracks: List[Dict], library_name: str, library_id: str, source_url: str = None):
+    """Show the TUI or a terminal summary of the report, based on config.
+
+    Timed as "report.display" so a run's metrics can leave out the time the
+    user spends in the viewer.
+    """
     cfg = load_config()
-    if cfg.get("SHOW_TUI_OUTPUT", True):
-        if cfg.get("TUI_FALLBACK_TO_TERMINAL", True):
-            # Try TUI, fall back to terminal summary if it fails
-            show_tui_report(json_data, library_name, library_id, source_url)
+    with metrics.stage("report.display"):
+        if cfg.get("SHOW_TUI_OUTPUT", True):
+            if cfg.get("TUI_FALLBACK_TO_TERMINAL", True):
+                # Try TUI, fall back to terminal summary if it fails
+                show_tui_report(tracks, library_name, library_id, source_url)
+            else:
+                # Only show TUI if available
+                try:
+                    import curses
+                    show_tui_report(tracks, library_name, library_id, source_url)
+                except ImportError:
+                    print("[DABHound] TUI not available. Set TUI_FALLBACK_TO_TERMINAL=true in config to show terminal summary.")
         else:
-            # Only show TUI if available
-            try:
-                import curses
-                show_tui_report(json_data, library_name, library_id, source_url)
-            except ImportError:
-                print("[DABHound] TUI not available. Set TUI_FALLBACK_TO_TERMINAL=true in config to show terminal summary.")
-    else:
-        # Just show terminal summary of missing tracks
-        show_terminal_summary(json_data, library_name, library_id)
+            # Just show terminal summary of missing tracks
+            show_terminal_summary(tracks, library_name, library_id)
 
 
-def load_report(source_url: str) -> Dict:
-    """Load JSON report for a given source_url (by md5)."""
+def _json_entry(entry: Dict) -> Dict:
+    """A report entry as the JSON report lists it (without the TXT-only DAB fields)."""
+    return {key: value for key, value in entry.items() if key not in report_store.DAB_FIELDS}
+
+
+def _import_json_report(source_url: str) -> Optional[Dict]:
+    """Move a JSON report written before the report store existed into the store."""
     json_path = REPORT_DIR / f"report_{md5_hash(source_url)}.json"
-    if not json_path.exists():
-        return {}
-    with json_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    try:
+        with json_path.open("r", encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    header = {key: value for key, value in report.items() if key != "tracks"}
+    header["source_url"] = source_url
+    report_store.save(source_url, header, report.get("tracks", []))
+    return report_store.get(source_url)
 
 
-def append_tracks_to_report(source_url: str, new_tracks: List[Dict], library_id: str, library_name: str, matching_mode: str):
-    """Append new tracks to existing JSON report and update TXT report."""
-    report = load_report(source_url)
+def get_report(source_url: str) -> Dict:
+    """The stored report header (library, mode, snapshot) for a source, or {} if there is none."""
+    return report_store.get(source_url) or _import_json_report(source_url) or {}
 
+
+def load_report(source_url: str) -> Dict:
+    """Load the full report (header and tracks) for a source, or {} if there is none."""
+    report = get_report(source_url)
+    if report:
+        report["tracks"] = report_store.tracks(source_url)
+    return report
+
+
+def append_tracks_to_report(source_url: str, new_tracks: List[Dict], library_id: str, library_name: str, matching_mode: str,
+                            sync_state: Optional[Dict] = None, show: bool = True):
+    """Append new tracks to the source's stored report, skipping track IDs it already holds.
+
+    Only the new entries are written. ``show=False`` skips the TUI/terminal
+    summary (batch runs print their own).
+    """
     # fallback: create new report if none exists
-    if not report:
+    if not get_report(source_url):
         return generate_report(
             input_tracks=[t for t in new_tracks],
             matched_tracks=[t for t in new_tracks if t.get("dab_track_id")],
@@ -117,88 +143,107 @@ def append_tracks_to_report(source_url: str, new_tracks: List[Dict], library_id:
             mode=matching_mode,
             library_name=library_name,
             library_id=library_id,
-            source_url=source_url
+            source_url=source_url,
+            sync_state=sync_state,
+            show=show
         )
 
-    # deduplicate by track_id
-    existing_ids = {t.get("track_id") for t in report.get("tracks", [])}
-    appended_count = 0
-
-    for t in new_tracks:
-        track_id = t.get("track_id") or f"{t['artist']} - {t['title']}"
-        if track_id not in existing_ids:
-            report["tracks"].append({
-                "artist": t["artist"],
-                "title": t["title"],
-                "isrc": t.get("isrc"),
-                "track_id": track_id,
-                "match_status": "FOUND" if t.get("dab_track_id") else "NOT FOUND",
-                "dab_track_id": t.get("dab_track_id")
-            })
-            existing_ids.add(track_id)
-            appended_count += 1
-
-    # update timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    report["timestamp"] = timestamp
+    entries = [_entry(t, t.get("dab_track_id")) for t in new_tracks]
+    with metrics.stage("report.write", tracks=len(entries)):
+        appended_count = report_store.append(source_url, entries, timestamp, sync_state)
 
-    # save JSON report
-    json_path = REPORT_DIR / f"report_{md5_hash(source_url)}.json"
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    print(f"[DABHound] Appended {appended_count} new tracks to the report")
+    
+    if show:
+        show_report(report_store.tracks(source_url), library_name, library_id, source_url)
+
+def export_report(source_url: str):
+    """Write the source's TXT (verbose) and JSON (minimal) reports; returns their paths, or None."""
+    report = get_report(source_url)
+    if not report:
+        return None
+    entries = report_store.tracks(source_url, with_dab_fields=True)
 
-    # save TXT report
+    # TXT report
     lines = [
-        f"DABHounds Conversion Report — {timestamp}",
+        f"DABHounds Conversion Report — {report['timestamp']}",
         f"Source URL: {source_url}",
-        f"Matching Mode: {matching_mode.upper()}",
-        f"DAB Library ID: {library_id}",
+        f"Matching Mode: {(report.get('matching_mode') or '').upper()}",
+        f"DAB Library ID: {report['library_id']}",
         "-"*60
     ]
-    for i, t in enumerate(report["tracks"], start=1):
+    for i, t in enumerate(entries, start=1):
         lines.append(f"{i}. {t['artist']} - {t['title']}")
         lines.append(f"    ISRC: {t.get('isrc') or 'N/A'}")
         lines.append(f"    Match Status: {t.get('match_status', 'NOT FOUND')}")
         if t.get("dab_track_id"):
-            lines.append(f"    DAB Track: {t['artist']} - {t['title']} (ID: {t['dab_track_id']})")
+            lines.append(f"    DAB Track: {t.get('dab_artist') or t['artist']} - {t.get('dab_title') or t['title']} "
+                         f"(ID: {t['dab_track_id']})")
         else:
             lines.append("    DAB Track: —")
         lines.append(f"    Track ID: {t.get('track_id', 'N/A')}")
         lines.append("")
 
-    safe_name = library_name.replace(" ", "_").replace(":", "-")
-    txt_path = REPORT_DIR / f"report_{safe_name}.txt"
-    with txt_path.open("w", encoding="utf-8") as f:
+    txt_path = REPORT_DIR / f"report_{_safe_name(report['library_name'])}.txt"
+    with metrics.stage("report.write", file=txt_path.name), txt_path.open("w", encoding="utf-8") as f:
         f.write("\n".join(lines))
 
-    print(f"[DABHound] Appended {appended_count} new tracks to JSON report {json_path} and TXT report {txt_path}")
-    
-    # Show TUI or terminal summary
-    cfg = load_config()
-    if cfg.get("SHOW_TUI_OUTPUT", True):
-        if cfg.get("TUI_FALLBACK_TO_TERMINAL", True):
-            show_tui_report(report["tracks"], library_name, library_id, source_url)
-        else:
-            try:
-                import curses
-                show_tui_report(report["tracks"], library_name, library_id, source_url)
-            except ImportError:
-                print("[DABHound] TUI not available. Set TUI_FALLBACK_TO_TERMINAL=true in config to show terminal summary.")
-    else:
-        show_terminal_summary(report["tracks"], library_name, library_id)
+    # JSON report
+    json_path = REPORT_DIR / f"report_{md5_hash(source_url)}.json"
+    json_report = dict(report, tracks=[_json_entry(e) for e in entries])
+    with metrics.stage("report.write", file=json_path.name), json_path.open("w", encoding="utf-8") as f:
+        json.dump(json_report, f, indent=2)
+
+    return txt_path, json_path
+
+def _safe_name(library_name: Optional[str]) -> str:
+    return (library_name or "none").replace(" ", "_").replace(":", "-")
 
 def delete_report(link: str):
-    """Delete old report files (txt and json) associated with a link."""
-    hash_val = md5_hash(link)
-    
-    deleted_any = False
-    for ext in [".json", ".txt"]:
-        for file in REPORT_DIR.glob(f"*{hash_val}*{ext}"):
-            try:
-                os.remove(file)
-                deleted_any = True
-            except Exception:
-                pass
-
-    if deleted_any:
-        print(f"[DABHound] Old report(s) for this link removed.")
\ No newline at end of file
+    """Delete the stored report for a link and the TXT/JSON files exported from it."""
+    report = get_report(link)
+    if not report:
+        return
+    report_store.delete(link)
+    for path in (REPORT_DIR / f"report_{md5_hash(link)}.json",
+                 REPORT_DIR / f"report_{_safe_name(report.get('library_name'))}.txt"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    print(f"[DABHound] Old report for this link removed.")
+
+
+def write_batch_summary(summaries: List[Dict]):
+    """Write TXT and JSON summaries of a batch run; returns their paths.
+
+    The per-link reports are written by each conversion as usual.
+    """
+    stamp = datetime.now()
+    timestamp = stamp.strftime("%Y-%m-%d %H:%M")
+    name = f"batch_{stamp.strftime('%Y%m%d_%H%M%S')}"
+
+    json_path = REPORT_DIR / f"{name}.json"
+    with metrics.stage("report.write", file=json_path.name), json_path.open("w", encoding="utf-8") as f:
+        json.dump({"timestamp": timestamp, "links": summaries}, f, indent=2)
+
+    lines = [
+        f"DABHounds Batch Report — {timestamp}",
+        f"Links: {len(summaries)}",
+        f"Tracks Matched: {sum(s['matched'] for s in summaries)}/{sum(s['tracks'] for s in summaries)}",
+        "-"*60
+    ]
+    for i, s in enumerate(summaries, start=1):
+        lines.append(f"{i}. {s['link']}")
+        lines.append(f"    Status: {s['status'].upper()}" + (f" ({s['error']})" if s.get("error") else ""))
+        lines.append(f"    Matched: {s['matched']}/{s['tracks']} (added {s['added']})")
+        lines.append(f"    DAB Library: {s.get('library_name') or '—'} (ID: {s.get('library_id') or 'N/A'})")
+        lines.append("")
+
+    txt_path = REPORT_DIR / f"{name}.txt"
+    with metrics.stage("report.write", file=txt_path.name), txt_path.open("w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+    return txt_path, json_path
@@ -0,0 +1,187 @@
+# dabhounds/core/report_store.py
+
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from dabhounds.core.db import Database, STATE_DB
+
+_TRACKS_TABLE = """
+CREATE TABLE IF NOT EXISTS report_tracks (
+    source_url TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    artist TEXT,
+    title TEXT,
+    isrc TEXT,
+    match_status TEXT NOT NULL,
+    dab_track_id,
+    dab_artist TEXT,
+    dab_title TEXT,
+    spotify_id TEXT,
+    yt_id TEXT
+);
+"""
+# Not unique: a playlist can list the same artist and title more than once
+_TRACKS_INDEX = "CREATE INDEX IF NOT EXISTS report_tracks_source ON report_tracks (source_url, track_id);"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    source_url TEXT PRIMARY KEY,
+    library_name TEXT,
+    library_id TEXT,
+    matching_mode TEXT,
+    timestamp TEXT,
+    sync_state TEXT,
+    updated_at REAL NOT NULL
+);
+""" + _TRACKS_TABLE + _TRACKS_INDEX
+
+# Columns of a report entry, in the order the JSON report lists them
+ENTRY_FIELDS = ("artist", "title", "isrc", "track_id", "match_status", "dab_track_id")
+# Only present in the JSON report when set
+SOURCE_ID_FIELDS = ("spotify_id", "yt_id")
+# Kept for the TXT report only
+DAB_FIELDS = ("dab_artist", "dab_title")
+
+_COLUMNS = ENTRY_FIELDS + SOURCE_ID_FIELDS + DAB_FIELDS
+_INSERT = (f"INSERT INTO report_tracks (source_url, {', '.join(_COLUMNS)}) "
+           f"VALUES (?, {', '.join('?' * len(_COLUMNS))})")
+
+_DB: Optional[Database] = None
+_DB_LOCK = threading.Lock()
+
+
+def _get_db() -> Database:
+    global _DB
+    with _DB_LOCK:
+        if _DB is None:
+            _DB = Database(STATE_DB, SCHEMA)
+            _drop_track_key(_DB)
+        return _DB
+
+
+def _drop_track_key(db: Database):
+    """Rebuild a report_tracks table created with (source_url, track_id) as its primary key."""
+    if not any(row["pk"] for row in db.query("PRAGMA table_info(report_tracks)")):
+        return
+    columns = ", ".join(("source_url",) + _COLUMNS)
+    with db.lock:
+        db.conn.executescript(
+            "BEGIN;"
+            "ALTER TABLE report_tracks RENAME TO report_tracks_old;"
+            + _TRACKS_TABLE
+            + f"INSERT INTO report_tracks ({columns}) SELECT {columns} FROM report_tracks_old ORDER BY rowid;"
+            "DROP TABLE report_tracks_old;"
+            + _TRACKS_INDEX
+            + "COMMIT;"
+        )
+
+
+def _rows(source_url: str, entries: Iterable[Dict]) -> List[tuple]:
+    return [(source_url, *(entry.get(field) for field in _COLUMNS)) for entry in entries]
+
+
+def get(source_url: str) -> Optional[Dict]:
+    """The report header (no tracks) for a source, or None.
+
+    Shaped like the JSON report: library_name, library_id, matching_mode,
+    timestamp, source_url and, if stored, spotify_snapshot.
+    """
+    rows = _get_db().query("SELECT * FROM reports WHERE source_url = ?", (source_url,))
+    if not rows:
+        return None
+    row = rows[0]
+    header = {key: row[key] for key in ("library_name", "library_id", "matching_mode", "timestamp", "source_url")}
+    if row["sync_state"]:
+        header["spotify_snapshot"] = json.loads(row["sync_state"])
+    return header
+
+
+def save(source_url: str, header: Dict, entries: List[Dict]):
+    """Store a whole report, replacing any earlier one for the source."""
+    db = _get_db()
+    sync_state = header.get("spotify_snapshot")
+    with db.lock, db.conn:
+        db.conn.execute("DELETE FROM report_tracks WHERE source_url = ?", (source_url,))
+        db.conn.execute(
+            "INSERT OR REPLACE INTO reports "
+            "(source_url, library_name, library_id, matching_mode, timestamp, sync_state, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (source_url, header.get("library_name"), header.get("library_id"), header.get("matching_mode"),
+             header.get("timestamp"), json.dumps(sync_state) if sync_state else None, time.time()),
+        )
+        db.conn.executemany(_INSERT, _rows(source_url, entries))
+
+
+def append(source_url: str, entries: List[Dict], timestamp: str, sync_state: Optional[Dict] = None) -> int:
+    """Add entries whose track_id is not in the report yet; returns how many were added.
+
+    Only the new rows and the header are written, so the cost follows the
+    number of new tracks rather than the size of the report.
+    """
+    db = _get_db()
+    with db.lock, db.conn:
+        seen = {row["track_id"] for row in db.conn.execute(
+            "SELECT track_id FROM report_tracks WHERE source_url = ?", (source_url,)
+        )}
+        new = []
+        for entry in entries:
+            if entry["track_id"] not in seen:
+                seen.add(entry["track_id"])
+                new.append(entry)
+        db.conn.executemany(_INSERT, _rows(source_url, new))
+        if sync_state:
+            db.conn.execute(
+                "UPDATE reports SET timestamp = ?, sync_state = ?, updated_at = ? WHERE source_url = ?",
+                (timestamp, json.dumps(sync_state), time.time(), source_url),
+            )
+        else:
+            db.conn.execute(
+                "UPDATE reports SET timestamp = ?, updated_at = ? WHERE source_url = ?",
+                (timestamp, time.time(), source_url),
+            )
+    return len(new)
+
+
+def tracks(source_url: str, with_dab_fields: bool = False) -> List[Dict]:
+    """All entries of a report in the order they were added, shaped like the JSON report's."""
+    rows = _get_db().query(
+        f"SELECT {', '.join(_COLUMNS)} FROM report_tracks WHERE source_url = ? ORDER BY rowid", (source_url,)
+    )
+    entries = []
+    for row in rows:
+        entry = {field: row[field] for field in ENTRY_FIELDS}
+        entry.update({field: row[field] for field in SOURCE_ID_FIELDS if row[field]})
+        if with_dab_fields:
+            entry.update({field: row[field] for field in DAB_FIELDS})
+        entries.append(entry)
+    return entries
+
+
+def track_keys(source_url: str) -> List[Dict]:
+    """The identifying fields (source IDs, ISRC, artist, title) of every entry, without the rest."""
+    rows = _get_db().query(
+        "SELECT spotify_id, yt_id, isrc, artist, title FROM report_tracks WHERE source_url = ?", (source_url,)
+    )
+    keys = []
+    for row in rows:
+        entry = {"artist": row["artist"], "title": row["title"], "isrc": row["isrc"]}
+        entry.update({field: row[field] for field in SOURCE_ID_FIELDS if row[field]})
+        keys.append(entry)
+    return keys
+
+
+def delete(source_url: str):
+    db = _get_db()
+    with db.lock, db.conn:
+        db.conn.execute("DELETE FROM report_tracks WHERE source_url = ?", (source_url,))
+        db.conn.execute("DELETE FROM reports WHERE source_url = ?", (source_url,))
+
+
+def sources(updated_since: float = 0.0) -> List[str]:
+    """Source URLs of every stored report (only those updated after ``updated_since``, if given)."""
+    rows = _get_db().query(
+        "SELECT source_url FROM reports WHERE updated_at > ? ORDER BY source_url", (updated_since,)
+    )
+    return [row["source_url"] for row in rows]
@@ -0,0 +1,118 @@
+# dabhounds/core/scoring.py
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+
+# "(feat. X)", "[ft. X]", "- feat. X" and trailing "featuring X" credits
+_FEAT_RE = re.compile(r"[\(\[]\s*(?:feat|ft|featuring)\b[^\)\]]*[\)\]]|\s-?\s*\b(?:feat|ft|featuring)\b\.?.*$")
+# "(Remastered 2011)", "- 2009 Remaster", "[Remastered Version]"
+_REMASTER_RE = re.compile(
+    r"[\(\[][^\)\]]*\bremaster(?:ed)?\b[^\)\]]*[\)\]]|\s-\s*(?:\d{4}\s+)?remaster(?:ed)?\b.*$"
+)
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# Seconds of duration difference tolerated before the score is penalized,
+# how many points each further second costs, and the largest penalty.
+DURATION_TOLERANCE = 3
+DURATION_PENALTY_PER_SEC = 1.0
+DURATION_PENALTY_MAX = 20.0
+# At most this many points reward higher sample rate / bit depth, so
+# quality only separates candidates that match equally well.
+QUALITY_BONUS_MAX = 1.0
+# Score of a candidate whose normalized key and duration match exactly
+EXACT_SCORE = 100.0
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(text: str) -> str:
+    """Casefold, strip diacritics, feat./remaster noise and punctuation."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = _FEAT_RE.sub(" ", text)
+    text = _REMASTER_RE.sub(" ", text)
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def match_key(artist: str, title: str) -> str:
+    return f"{normalize_text(artist)} {normalize_text(title)}".strip()
+
+
+def _duration_penalty(duration_ms: Optional[int], candidate: Dict) -> float:
+    # DAB reports durations in seconds
+    if not duration_ms or not candidate.get("duration"):
+        return 0.0
+    diff = abs(duration_ms / 1000 - float(candidate["duration"]))
+    if diff <= DURATION_TOLERANCE:
+        return 0.0
+    return min(DURATION_PENALTY_MAX, (diff - DURATION_TOLERANCE) * DURATION_PENALTY_PER_SEC)
+
+
+def _quality_bonus(candidate: Dict) -> float:
+    aq = candidate.get("audioQuality") or {}
+    rate = min(float(aq.get("maximumSampleRate") or 0), 192.0) / 192.0
+    depth = min(float(aq.get("maximumBitDepth") or 0), 24.0) / 24.0
+    return QUALITY_BONUS_MAX * (rate + depth) / 2
+
+
+def score_candidates(artist: str, title: str, candidates: Sequence[Dict],
+                     duration_ms: Optional[int] = None) -> List[Tuple[float, Dict]]:
+    """Score every candidate against the wanted artist and title, best first.
+
+    Text similarity is token_set_ratio on normalized "artist title" keys,
+    computed in one rapidfuzz call over all candidates. A duration mismatch
+    subtracts up to DURATION_PENALTY_MAX points. Audio quality is not part
+    of the score; it adds up to QUALITY_BONUS_MAX points to the ranking only.
+    """
+    if not candidates:
+        return []
+    keys = [match_key(c.get("artist", ""), c.get("title", "")) for c in candidates]
+
+    text_scores = process.extract(
+        match_key(artist, title), keys, scorer=fuzz.token_set_ratio, processor=None, limit=None
+    )
+    scored = [(score - _duration_penalty(duration_ms, candidates[i]), candidates[i]) for _, score, i in text_scores]
+    scored.sort(key=lambda pair: pair[0] + _quality_bonus(pair[1]), reverse=True)
+    return scored
+
+
+def best_exact_candidate(artist: str, title: str, candidates: Sequence[Dict], duration_ms: Optional[int] = None,
+                         require_duration: bool = False) -> Optional[Dict]:
+    """The best candidate whose normalized key equals the wanted one and whose duration agrees, or None.
+
+    Ties go to the better duration fit, then audio quality. A missing
+    duration counts as agreeing unless ``require_duration`` is set.
+    """
+    wanted = match_key(artist, title)
+    exact = [
+        c for c in candidates
+        if match_key(c.get("artist", ""), c.get("title", "")) == wanted
+        and not _duration_penalty(duration_ms, c)
+        and (not require_duration or (duration_ms and c.get("duration")))
+    ]
+    if not exact:
+        return None
+    return max(exact, key=lambda c: _quality_bonus(c) - _duration_penalty(duration_ms, c))
+
+
+def best_candidate(artist: str, title: str, candidates: Sequence[Dict], threshold: float,
+                   duration_ms: Optional[int] = None) -> Optional[Tuple[float, Dict]]:
+    """(score, candidate) for the best-ranked candidate whose score clears ``threshold``, else None.
+
+    Only the text score less the duration penalty is held against the
+    threshold; audio quality just ranks the candidates that pass. Candidates whose normalized key equals the wanted one (and whose
+    duration agrees) are taken without text scoring: the best of them by
+    duration fit and audio quality, the same terms the scored path adds,
+    is returned scored EXACT_SCORE.
+    """
+    exact = best_exact_candidate(artist, title, candidates, duration_ms)
+    if exact:
+        return EXACT_SCORE, exact
+
+    scored = score_candidates(artist, title, candidates, duration_ms)
+    return next((pair for pair in scored if pair[0] >= threshold), None)
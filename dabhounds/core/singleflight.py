@@ -0,0 +1,95 @@
+# dabhounds/core/singleflight.py
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+# Results remembered per group; older ones fall back to the on-disk cache
+MAX_REMEMBERED = 4096
+
+
+class SingleFlight:
+    """Collapse identical lookups within a run into one call.
+
+    Callers asking for a key that is already being fetched wait for that
+    fetch instead of starting another, and keys fetched earlier in the run
+    are answered from memory. None results and exceptions are shared with
+    the callers that were waiting but not remembered, so a failed lookup
+    can be retried later.
+    """
+
+    def __init__(self, max_remembered: int = MAX_REMEMBERED):
+        self.max_remembered = max_remembered
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._done: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                return self._done[key]
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if result is not None:
+                self._done[key] = result
+                if len(self._done) > self.max_remembered:
+                    self._done.popitem(last=False)
+        fut.set_result(result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._done.clear()
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop."""
+
+    def __init__(self, max_remembered: int = MAX_REMEMBERED):
+        self.max_remembered = max_remembered
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._done: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        if key in self._done:
+            self._done.move_to_end(key)
+            return self._done[key]
+        fut = self._inflight.get(key)
+        if fut is not None:
+            # shield: one waiter being cancelled must not cancel the shared fetch
+            return await asyncio.shield(fut)
+
+        fut = asyncio.ensure_future(fn(*args, **kwargs))
+        self._inflight[key] = fut
+        try:
+            result = await asyncio.shield(fut)
+        finally:
+            self._inflight.pop(key, None)
+        if result is not None:
+            self._done[key] = result
+            if len(self._done) > self.max_remembered:
+                self._done.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._done.clear()
@@ -1,8 +1,33 @@
 # dabhounds/core/spotify.py
 
-from typing import List, Dict, Any
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Set
 import spotipy
 
+from dabhounds.core import metrics
+
+# Largest page sizes the Web API accepts
+PLAYLIST_PAGE_SIZE = 100
+ALBUM_PAGE_SIZE = 50
+TRACKS_BATCH_SIZE = 50
+# Playlist pages fetched concurrently once the total is known
+PAGE_WORKERS = 4
+
+# Only request what _track_from_item() reads
+TRACK_FIELDS = "id,name,duration_ms,artists(name),external_ids(isrc),external_urls(spotify)"
+PAGE_FIELDS = f"items(track({TRACK_FIELDS})),total"
+# Incremental resyncs only need IDs to tell which tracks are new
+ID_PAGE_FIELDS = "items(track(id)),total"
+PLAYLIST_FIELDS = f"name,description,snapshot_id,tracks({PAGE_FIELDS})"
+
+
+def page_digest(track_ids: List[Optional[str]]) -> str:
+    """Fingerprint of one playlist page, stored so a resync can skip pages that did not change."""
+    return hashlib.md5("\n".join(i or "" for i in track_ids).encode("utf-8")).hexdigest()
+
+
 class SpotifyFetcher:
     def __init__(self, sp_client):
         self.sp = sp_client  # Pass either public or OAuth client
@@ -21,63 +46,170 @@ class SpotifyFetcher:
     # ---------------------------------------------------------
     # PLAYLIST
     # ---------------------------------------------------------
-    def get_playlist_tracks(self, playlist_url: str) -> Dict[str, Any]:
-        playlist_id = playlist_url.split("/")[-1].split("?")[0]
+    @staticmethod
+    def _track_from_item(track: Dict) -> Dict:
+        return {
+            "title": track["name"],
+            "artist": ", ".join([a["name"] for a in track["artists"]]),
+            "isrc": track.get("external_ids", {}).get("isrc"),
+            "duration_ms": track["duration_ms"],
+            "spotify_id": track["id"],
+            "source_id": track["external_urls"]["spotify"],
+        }
+
+    def _call(self, endpoint: str, method, *args, **kwargs):
+        """One Web API call, timed for --metrics and --trace."""
+        span_args = {"offset": kwargs["offset"]} if "offset" in kwargs else {}
+        with metrics.request("spotify", endpoint, **span_args):
+            return method(*args, **kwargs)
 
-        # Fetch metadata (name + description)
-        playlist_obj = self.sp.playlist(playlist_id)
+    def _playlist_page(self, playlist_id: str, offset: int, fields: str = PAGE_FIELDS) -> Dict:
+        return self._call(
+            "playlist_items",
+            self.sp.playlist_items,
+            playlist_id,
+            fields=fields,
+            limit=PLAYLIST_PAGE_SIZE,
+            offset=offset,
+            additional_types=("track",),
+        )
 
-        results = self.sp.playlist_tracks(playlist_id)
+    def _tracks_by_id(self, track_ids: List[str]) -> List[Dict]:
+        """Full track objects for the given IDs, TRACKS_BATCH_SIZE per request."""
         tracks = []
+        for start in range(0, len(track_ids), TRACKS_BATCH_SIZE):
+            batch = self._call("tracks", self.sp.tracks, track_ids[start:start + TRACKS_BATCH_SIZE])
+            tracks.extend(self._track_from_item(t) for t in batch["tracks"] if t)
+        return tracks
 
-        while results:
-            for item in results["items"]:
-                track = item["track"]
-                if not track:
-                    continue
-                tracks.append({
-                    "title": track["name"],
-                    "artist": ", ".join([a["name"] for a in track["artists"]]),
-                    "isrc": track["external_ids"].get("isrc"),
-                    "duration_ms": track["duration_ms"],
-                    "spotify_id": track["id"],
-                    "source_id": track["external_urls"]["spotify"],
-                })
-
-            results = self.sp.next(results) if results.get("next") else None
+    def iter_playlist_tracks(self, playlist_id: str, first_page: Dict = None,
+                             known_ids: Optional[Set[str]] = None,
+                             state: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield playlist tracks in order, fetching the remaining pages concurrently.
 
-        return {
+        ``first_page`` is the ``tracks`` object embedded in the playlist
+        response; its ``total`` tells us every remaining offset up front, so
+        those pages are requested in parallel (at most PAGE_WORKERS at a
+        time) instead of following ``next`` links one by one.
+
+        With ``known_ids`` (an incremental resync), the remaining pages are
+        fetched with IDs only. Pages whose digest matches ``state["previous"]``
+        are skipped, and only tracks not in ``known_ids`` are fetched in full
+        and yielded. Page digests are recorded in ``state["pages"]`` and
+        ``state["complete"]`` is set once every page has been read.
+        """
+        if first_page is None:
+            first_page = self._playlist_page(playlist_id, 0)
+        state = state if state is not None else {}
+        state.setdefault("pages", [])
+        previous = state.get("previous") or []
+        fields = PAGE_FIELDS if known_ids is None else ID_PAGE_FIELDS
+
+        pages = [first_page]
+        offsets = deque(range(len(first_page["items"]), first_page.get("total") or 0, PLAYLIST_PAGE_SIZE))
+
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix="dabhound-spotify") as pool:
+            pending = deque()
+
+            def fill():
+                while offsets and len(pending) < PAGE_WORKERS:
+                    pending.append(pool.submit(self._playlist_page, playlist_id, offsets.popleft(), fields))
+
+            fill()
+            while pages or pending:
+                full = bool(pages)  # the first page always carries full track objects
+                page = pages.pop() if pages else pending.popleft().result()
+                fill()
+
+                items = [item.get("track") or {} for item in page["items"]]
+                index = len(state["pages"])
+                digest = page_digest([t.get("id") for t in items])
+                state["pages"].append(digest)
+
+                if known_ids is None:
+                    new = [t for t in items if t.get("id")]
+                else:
+                    if index < len(previous) and previous[index] == digest:
+                        continue
+                    new = [t for t in items if t.get("id") and t["id"] not in known_ids]
+                    if not new:
+                        continue
+                    if not full:
+                        yield from self._tracks_by_id([t["id"] for t in new])
+                        continue
+
+                for track in new:
+                    yield self._track_from_item(track)
+
+        state["complete"] = True
+
+    def stream_playlist_tracks(self, playlist_url: str, sync_state: Optional[Dict] = None,
+                               known_ids: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Like get_playlist_tracks(), but "tracks" is a lazy iterator.
+
+        ``sync_state`` is the state returned by a previous sync (snapshot_id
+        and page digests). If the playlist's snapshot_id has not changed,
+        nothing past the metadata call is fetched and "unchanged" is True.
+        Otherwise, when ``known_ids`` is given, only new tracks are fetched
+        (see iter_playlist_tracks). The returned "sync_state" is filled in as
+        the tracks are consumed.
+        """
+        playlist_id = playlist_url.split("/")[-1].split("?")[0]
+
+        # Metadata (name + description + snapshot) and the first page of tracks in one call
+        playlist_obj = self._call("playlist", self.sp.playlist, playlist_id, fields=PLAYLIST_FIELDS)
+        first_page = playlist_obj.get("tracks")
+        snapshot_id = playlist_obj.get("snapshot_id")
+
+        data = {
             "name": playlist_obj.get("name"),
             "description": playlist_obj.get("description"),
-            "tracks": tracks,
+            "total": (first_page or {}).get("total"),
+            "unchanged": False,
         }
 
+        if sync_state and snapshot_id and sync_state.get("snapshot_id") == snapshot_id:
+            data.update(unchanged=True, sync_state=sync_state, tracks=iter(()))
+            return data
+
+        state = {"snapshot_id": snapshot_id, "page_size": PLAYLIST_PAGE_SIZE, "pages": []}
+        if known_ids is not None and sync_state and sync_state.get("page_size") == PLAYLIST_PAGE_SIZE:
+            state["previous"] = sync_state.get("pages", [])
+        data["sync_state"] = state
+        data["tracks"] = self.iter_playlist_tracks(playlist_id, first_page, known_ids, state)
+        return data
+
+    def get_playlist_tracks(self, playlist_url: str) -> Dict[str, Any]:
+        data = self.stream_playlist_tracks(playlist_url)
+        data["tracks"] = list(data["tracks"])
+        return data
+
     # ---------------------------------------------------------
     # ALBUM
     # ---------------------------------------------------------
     def get_album_tracks(self, album_url: str) -> Dict[str, Any]:
         album_id = album_url.split("/")[-1].split("?")[0]
 
-        # Fetch metadata (albums do NOT have descriptions)
-        album_obj = self.sp.album(album_id)
+        # Fetch metadata (albums do NOT have descriptions); includes the first page of tracks
+        album_obj = self._call("album", self.sp.album, album_id)
 
-        results = self.sp.album_tracks(album_id)
-        tracks = []
+        page = album_obj["tracks"]
+        track_ids = [item["id"] for item in page["items"] if item.get("id")]
+        offset, total = len(page["items"]), page.get("total") or 0
+        while offset < total:
+            page = self._call("album_tracks", self.sp.album_tracks, album_id, limit=ALBUM_PAGE_SIZE, offset=offset)
+            if not page["items"]:
+                break
+            track_ids.extend(item["id"] for item in page["items"] if item.get("id"))
+            offset += len(page["items"])
 
-        for item in results["items"]:
-            track_info = self.sp.track(item["id"])
-            tracks.append({
-                "title": item["name"],
-                "artist": ", ".join([a["name"] for a in item["artists"]]),
-                "isrc": track_info.get("external_ids", {}).get("isrc"),
-                "duration_ms": item["duration_ms"],
-                "spotify_id": item["id"],
-                "source_id": track_info["external_urls"]["spotify"],
-            })
+        # Album track objects are simplified (no ISRC); fetch full objects in batches
+        tracks = self._tracks_by_id(track_ids)
 
         return {
             "name": album_obj.get("name"),
             "description": None,  # Albums don't have descriptions
+            "total": len(tracks),
             "tracks": tracks,
         }
 
@@ -86,7 +218,7 @@ class SpotifyFetcher:
     # ---------------------------------------------------------
     def get_track(self, track_url: str) -> Dict[str, Any]:
         track_id = track_url.split("/")[-1].split("?")[0]
-        track = self.sp.track(track_id)
+        track = self._call("track", self.sp.track, track_id)
 
         return {
             "name": track["name"],
@@ -104,16 +236,28 @@ class SpotifyFetcher:
     # ---------------------------------------------------------
     # ROUTER
     # ---------------------------------------------------------
-    def extract_tracks(self, url: str) -> Dict[str, Any]:
+    def _fetch(self, kind: str, url: str, stream: bool, **sync) -> Dict[str, Any]:
+        if kind == "playlist":
+            return self.stream_playlist_tracks(url, **sync) if stream else self.get_playlist_tracks(url)
+        elif kind == "album":
+            return self.get_album_tracks(url)
+        else:  # track
+            return self.get_track(url)
+
+    def extract_tracks(self, url: str, stream: bool = False, sync_state: Optional[Dict] = None,
+                       known_ids: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Fetch name, description and tracks for a Spotify URL.
+
+        With stream=True, playlist tracks are returned as an iterator that
+        fetches pages lazily (only the metadata call happens up front, so
+        access errors still surface here). ``sync_state`` and ``known_ids``
+        enable the incremental resync in stream_playlist_tracks().
+        """
+        sync = {"sync_state": sync_state, "known_ids": known_ids} if stream else {}
         kind = self.detect_spotify_type(url)
 
         try:
-            if kind == "playlist":
-                return self.get_playlist_tracks(url)
-            elif kind == "album":
-                return self.get_album_tracks(url)
-            else:  # track
-                return self.get_track(url)
+            return self._fetch(kind, url, stream, **sync)
 
         except spotipy.exceptions.SpotifyException as e:
             # Retry with OAuth if public client fails
@@ -123,12 +267,7 @@ class SpotifyFetcher:
                 self.sp = get_spotify_client()
 
                 try:
-                    if kind == "playlist":
-                        return self.get_playlist_tracks(url)
-                    elif kind == "album":
-                        return self.get_album_tracks(url)
-                    else:
-                        return self.get_track(url)
+                    return self._fetch(kind, url, stream, **sync)
                 except spotipy.exceptions.SpotifyException as e2:
                     if e2.http_status == 404:
                         print("[DABHound] Playlist could not be accessed via the API. "
@@ -137,4 +276,4 @@ class SpotifyFetcher:
                     else:
                         raise
             else:
-                raise
\ No newline at end of file
+                raise
@@ -1,34 +1,14 @@
 # dabhounds/core/spotify_auth.py
 
-import os
-import json
-from pathlib import Path
 from spotipy import Spotify
 from spotipy.oauth2 import SpotifyOAuth
 
-CONFIG_DIR = Path.home() / ".dabhound"
-CONFIG_FILE = CONFIG_DIR / "config.json"
+from dabhounds.core.auth import CONFIG_DIR, load_config, save_config
+
 CACHE_FILE = CONFIG_DIR / ".cache-dabhound"
 SPOTIFY_SCOPES = "playlist-read-private playlist-read-collaborative"
 HOWTO_URL = "https://rentry.co/dabhounds-spotify-setup"
 
-def load_config() -> dict:
-    if not CONFIG_FILE.exists():
-        return {}
-    try:
-        with CONFIG_FILE.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def save_config(config: dict):
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    try:
-        with CONFIG_FILE.open("w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
-    except Exception as e:
-        print(f"[DABHound] Failed to save config: {e}")
-
 def ensure_spotify_credentials(config: dict) -> dict:
     client_id = config.get("SPOTIFY_CLIENT_ID")
     client_secret = config.get("SPOTIFY_CLIENT_SECRET")
@@ -68,7 +48,7 @@ def get_spotify_auth_manager() -> SpotifyOAuth:
         token_info = auth_manager.get_cached_token()
         if token_info is None or auth_manager.is_token_expired(token_info):
             token_info = auth_manager.get_access_token(as_dict=True)
-        if token_info:
+        if token_info and token_info != config.get("SPOTIFY_TOKEN"):
             config["SPOTIFY_TOKEN"] = token_info
             save_config(config)
     except Exception as e:
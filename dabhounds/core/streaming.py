@@ -0,0 +1,57 @@
+# dabhounds/core/streaming.py
+
+import queue
+import threading
+from typing import Iterable, Iterator, Optional
+
+_DONE = object()
+
+
+class BoundedPrefetch:
+    """Iterate over ``source`` on a producer thread, at most ``maxsize`` items ahead.
+
+    The consumer sees items in order as soon as they are produced, so work on
+    the first items can start while the source is still being fetched, and a
+    slow consumer never makes the producer buffer more than ``maxsize`` items.
+    Exceptions raised by the source are re-raised in the consumer.
+    """
+
+    def __init__(self, source: Iterable, maxsize: int = 256):
+        self._source = source
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._stopped = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._produce, name="dabhound-fetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for item in self._source:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                if self._error:
+                    raise self._error
+                return
+            yield item
+
+    def close(self):
+        """Stop the producer early (e.g. the consumer failed or was interrupted)."""
+        self._stopped.set()
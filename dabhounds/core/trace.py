@@ -0,0 +1,151 @@
+# dabhounds/core/trace.py
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class Trace:
+    """Spans of one conversion, in Chrome trace-event format (Perfetto, chrome://tracing).
+
+    Every span is a complete ("X") event on the lane of the thread that ran
+    it. Coroutines of the async engine get lanes of their own, handed back
+    when their task ends, so overlapping requests do not pile up on the event
+    loop's thread.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.events: List[Dict] = []
+        self._lanes: Dict[tuple, int] = {}
+        # (lane, perf_counter() when its task ended)
+        self._free_task_lanes: List[tuple] = []
+        self._thread_lanes = 0
+        self._task_lanes = 0
+        self._name("process_name", 0, "dabhounds")
+
+    def _name(self, kind: str, tid: int, name: str):
+        self.events.append({"ph": "M", "name": kind, "pid": self._pid, "tid": tid, "args": {"name": name}})
+
+    def _lane(self, start: float) -> int:
+        """The lane of the running thread or task, for a span that began at ``start``."""
+        # Only look for a task when asyncio is in use at all
+        asyncio = sys.modules.get("asyncio")
+        task = None
+        if asyncio is not None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                pass
+        key = ("task", id(task)) if task is not None else ("thread", threading.get_ident())
+        tid = self._lanes.get(key)
+        if tid is not None:
+            return tid
+
+        if task is None:
+            self._thread_lanes += 1
+            tid = self._thread_lanes
+            self._name("thread_name", tid, threading.current_thread().name)
+        else:
+            # A lane freed after this span began would show two tasks overlapping
+            i = next((i for i, (_, freed) in enumerate(self._free_task_lanes) if freed <= start), None)
+            if i is not None:
+                tid = self._free_task_lanes.pop(i)[0]
+            else:
+                self._task_lanes += 1
+                tid = 1000 + self._task_lanes
+                self._name("thread_name", tid, f"async {self._task_lanes}")
+        self._lanes[key] = tid
+        if task is not None:
+            task.add_done_callback(lambda _task: self._release(key))
+        return tid
+
+    def _release(self, key: tuple):
+        with self._lock:
+            tid = self._lanes.pop(key, None)
+            if tid is not None:
+                self._free_task_lanes.append((tid, time.perf_counter()))
+
+    def begin(self) -> float:
+        """Claim the caller's lane for a span starting now; returns the start time."""
+        start = time.perf_counter()
+        with self._lock:
+            self._lane(start)
+        return start
+
+    def add(self, name: str, cat: str, start: float, duration: float, args: Optional[Dict] = None):
+        """Record a span that began at ``start`` (time.perf_counter()) and lasted ``duration`` seconds."""
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._t0) * 1e6, 1),
+            "dur": round(duration * 1e6, 1),
+            "pid": self._pid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            event["tid"] = self._lane(start)
+            self.events.append(event)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+
+# --- The trace of the conversion in progress (None when not tracing) ---
+
+_ACTIVE: Optional[Trace] = None
+
+
+def _on_dab_request(event: Dict):
+    t = _ACTIVE
+    if t is not None:
+        # Hooks run as soon as the response is in, so the span ends now
+        start = time.perf_counter() - event["elapsed"]
+        t.add(f"dab {event['method']} {event['path']}", "dab", start, event["elapsed"],
+              {"status": event["status"]})
+
+
+def start() -> Trace:
+    """Begin tracing a conversion."""
+    global _ACTIVE
+    from dabhounds.core.http import add_request_hook
+    _ACTIVE = Trace()
+    add_request_hook(_on_dab_request)
+    return _ACTIVE
+
+
+def finish() -> Optional[Dict]:
+    """Stop tracing; returns the trace-event document."""
+    global _ACTIVE
+    t, _ACTIVE = _ACTIVE, None
+    if t is None:
+        return None
+    from dabhounds.core.http import remove_request_hook
+    remove_request_hook(_on_dab_request)
+    return t.to_dict()
+
+
+def active() -> Optional[Trace]:
+    return _ACTIVE
+
+
+@contextmanager
+def span(name: str, cat: str, **args):
+    """Trace the enclosed block as one span."""
+    t = _ACTIVE
+    if t is None:
+        yield
+        return
+    t0 = t.begin()
+    try:
+        yield
+    finally:
+        t.add(name, cat, t0, time.perf_counter() - t0, args)
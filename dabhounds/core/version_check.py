@@ -0,0 +1,86 @@
+# dabhounds/core/version_check.py
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from dabhounds.core.auth import CONFIG_DIR, USER_AGENT
+
+VERSION_URL = "https://raw.githubusercontent.com/sherlockholmesat221b/DABHounds/main/VERSION"
+VERSION_CACHE = CONFIG_DIR / "version_check.json"
+# GitHub is asked at most once per TTL; every other run reads the cache
+CHECK_TTL_HOURS = 24
+FETCH_TIMEOUT = 5
+
+_THREAD: Optional[threading.Thread] = None
+_LOCK = threading.Lock()
+_ERROR: Optional[str] = None
+
+
+def _read_cache() -> dict:
+    try:
+        with VERSION_CACHE.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(latest: str):
+    tmp = VERSION_CACHE.with_suffix(".tmp")
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"latest": latest, "checked_at": time.time()}), encoding="utf-8")
+        os.replace(tmp, VERSION_CACHE)
+    except OSError:
+        pass
+
+
+def cached_latest(ttl_hours: float = CHECK_TTL_HOURS) -> Optional[str]:
+    """The latest version recorded by a check younger than ``ttl_hours``."""
+    cached = _read_cache()
+    if cached.get("latest") and time.time() - cached.get("checked_at", 0) < ttl_hours * 3600:
+        return cached["latest"]
+    return None
+
+
+def fetch_latest() -> Optional[str]:
+    """Ask GitHub for the latest version and cache it; None if that fails."""
+    global _ERROR
+    import urllib.request
+    try:
+        request = urllib.request.Request(VERSION_URL, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as r:
+            latest = r.read().decode("utf-8").strip()
+    except Exception as e:
+        _ERROR = str(e)
+        return None
+    if not latest:
+        _ERROR = "empty VERSION file"
+        return None
+    _ERROR = None
+    _write_cache(latest)
+    return latest
+
+
+def start_check():
+    """Refresh the cached version on a daemon thread, unless the cache is fresh."""
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None or cached_latest():
+            return
+        _THREAD = threading.Thread(target=fetch_latest, name="dabhound-version", daemon=True)
+        _THREAD.start()
+
+
+def latest_version(wait: float = 0) -> Optional[str]:
+    """The latest known version, waiting up to ``wait`` seconds for a running check."""
+    thread = _THREAD
+    if thread is not None and wait:
+        thread.join(wait)
+    return _read_cache().get("latest")
+
+
+def last_error() -> Optional[str]:
+    return _ERROR
@@ -1,13 +1,17 @@
 # dabhounds/core/youtube_parser_v3.py
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 import re
 import yt_dlp
 import logging
 import sys, threading, itertools, time
-from dabhounds.core.musicbrainz import resolve_track_metadata
+from dabhounds.core import metrics
+from dabhounds.core.musicbrainz import resolve_track_metadata, resolve_many
 
 LOG = logging.getLogger("YouTubeParserV3")
 
+# Marks a chapter whose MusicBrainz metadata has not been looked up yet
+_UNRESOLVED = object()
+
 # -----------------------
 # Spinner utility
 # -----------------------
@@ -78,10 +82,13 @@ class YouTubeParserV3:
     # -----------------------
     # STAGE 1: Raw extraction
     # -----------------------
-    def _extract_raw_entries(self, url: str) -> Tuple[List[Dict], Optional[Dict]]:
+    def _list_entries(self, url: str) -> Tuple[List[Optional[Dict]], Optional[Dict]]:
         """
+        Cheap first pass: list a playlist's videos without extracting each one.
+
         Return tuple:
-          - list of raw yt-dlp info dicts for each video entry
+          - list of entries; playlist entries are flat stubs (id/url/title),
+            a single video comes back fully extracted
           - playlist-level info dict (or None if not a playlist)
         """
         spinner = Spinner("[DABHound] Parsing YouTube metadata")
@@ -89,7 +96,9 @@ class YouTubeParserV3:
 
         info = None
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            opts = dict(self.ydl_opts)
+            opts["extract_flat"] = True if self.config["extract_mode"] == "flat" else "in_playlist"
+            with yt_dlp.YoutubeDL(opts) as ydl, metrics.request("youtube", "list"):
                 info = ydl.extract_info(url, download=False)
         except Exception as e:
             spinner.stop()
@@ -102,55 +111,70 @@ class YouTubeParserV3:
         if not info:
             return [], None
 
-        # Separate playlist-level metadata
-        playlist_info = None
-        entries = []
-
         if info.get("entries"):
-            # It's a playlist
-            playlist_info = info  # root info has playlist metadata
-            entries = info.get("entries", [])
-        else:
-            # Single video
-            entries = [info]
-
-        cleaned = []
-        failed_count = 0
+            # It's a playlist; root info has playlist metadata
+            return list(info.get("entries", [])), info
+        # Single video
+        return [info], None
+
+    def _clean_entry(self, i: int, e: Optional[Dict]) -> Optional[Dict]:
+        """Reduce a yt-dlp info dict to the fields the later stages use (None if unusable)."""
+        if not e:
+            LOG.warning(f"Entry {i+1} is None, skipping")
+            return None
 
-        for i, e in enumerate(entries):
-            if not e:
-                failed_count += 1
-                LOG.warning(f"Entry {i+1} is None, skipping")
-                continue
+        try:
+            entry_dict = {
+                "title": (e.get("title") or "").strip(),
+                "uploader": (e.get("uploader") or "").strip(),
+                "description": e.get("description", "") or "",
+                "duration": e.get("duration"),        # seconds or None
+                "id": e.get("id"),
+                "isrc": e.get("isrc"),
+                "raw": e,
+            }
+        except Exception as err:
+            LOG.error(f"Failed to process entry {i+1}: {err}")
+            print(f"\n[DABHound] Skipping entry {i+1} due to error: {err}")
+            return None
 
-            try:
-                entry_dict = {
-                    "title": e.get("title", "").strip(),
-                    "uploader": e.get("uploader", "").strip(),
-                    "description": e.get("description", "") or "",
-                    "duration": e.get("duration"),        # seconds or None
-                    "id": e.get("id"),
-                    "isrc": e.get("isrc"),
-                    "raw": e,
-                }
+        # Validate that we have at least a title or ID
+        if not entry_dict["title"] and not entry_dict["id"]:
+            LOG.warning(f"Entry {i+1} has no title or ID, skipping")
+            return None
+        return entry_dict
 
-                # Validate that we have at least a title or ID
-                if not entry_dict["title"] and not entry_dict["id"]:
+    def _iter_raw_entries(self, entries: List[Optional[Dict]]) -> Iterator[Dict]:
+        """Fully extract listed entries one video at a time, yielding each as soon as it is ready."""
+        failed_count = 0
+        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            for i, e in enumerate(entries):
+                if e and e.get("_type") in ("url", "url_transparent") and self.config["extract_mode"] != "flat":
+                    video_url = e.get("url") or f"https://www.youtube.com/watch?v={e.get('id')}"
+                    try:
+                        with metrics.request("youtube", "extract", url=video_url):
+                            e = ydl.extract_info(video_url, download=False)
+                    except Exception as err:
+                        LOG.error(f"Failed to extract entry {i+1}: {err}")
+                        e = None
+
+                cleaned = self._clean_entry(i, e)
+                if cleaned is None:
                     failed_count += 1
-                    LOG.warning(f"Entry {i+1} has no title or ID, skipping")
                     continue
-
-                cleaned.append(entry_dict)
-            except Exception as e:
-                failed_count += 1
-                LOG.error(f"Failed to process entry {i+1}: {e}")
-                print(f"\n[DABHound] Skipping entry {i+1} due to error: {e}")
-                continue
+                yield cleaned
 
         if failed_count > 0:
             print(f"[DABHound] Warning: {failed_count} track(s) failed to extract and were skipped")
 
-        return cleaned, playlist_info
+    def _extract_raw_entries(self, url: str) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Return tuple:
+          - list of raw yt-dlp info dicts for each video entry
+          - playlist-level info dict (or None if not a playlist)
+        """
+        entries, playlist_info = self._list_entries(url)
+        return list(self._iter_raw_entries(entries)), playlist_info
 
     # -----------------------
     # STAGE 2: Chapter splitting
@@ -278,7 +302,24 @@ class YouTubeParserV3:
     # ------------------------------------
     # STAGE 4: Metadata enrichment (opt)
     # ------------------------------------
-    def _enrich_metadata(self, track: Dict) -> Dict:
+    def _prefetch_metadata(self, bases: List[Dict]) -> List:
+        """Resolve MusicBrainz metadata for all chapters of a video in batched queries."""
+        results = [_UNRESOLVED] * len(bases)
+        if not self.config.get("use_musicbrainz"):
+            return results
+        todo = [i for i, b in enumerate(bases) if not b.get("isrc") and b.get("artist") and b.get("title")]
+        if len(todo) < 2:
+            return results
+        try:
+            found = resolve_many([(bases[i]["title"], bases[i]["artist"]) for i in todo])
+        except Exception as e:
+            LOG.debug("MB batch enrichment failed: %s", e)
+            return results
+        for i, mb in zip(todo, found):
+            results[i] = mb
+        return results
+
+    def _enrich_metadata(self, track: Dict, mb=_UNRESOLVED) -> Dict:
         try:
             # If isrc present — short-circuit
             if track.get("isrc"):
@@ -294,7 +335,8 @@ class YouTubeParserV3:
                 title = track.get("title") or ""
                 if artist and title:
                     try:
-                        mb = resolve_track_metadata(title, artist)
+                        if mb is _UNRESOLVED:
+                            mb = resolve_track_metadata(title, artist)
                         if mb:
                             # update fields if present
                             if mb.get("title"):
@@ -368,77 +410,117 @@ class YouTubeParserV3:
     # ------------------------------------
     # MAIN: parse(url)
     # ------------------------------------
-    def parse(self, url: str) -> Dict:
-        raw_entries, playlist_info = self._extract_raw_entries(url)
+    def _tracks_from_raw(self, raw: Dict) -> Tuple[List[Dict], int]:
+        """Run stages 2-6 for one video. Returns (tracks, number of chapters that failed)."""
+        tracks: List[Dict] = []
+        failed_tracks = 0
 
-        playlist_title = None
-        playlist_description = None
+        chapters = [{"title": raw["title"], "start_sec": 0}]
+        if self.config.get("split_chapters"):
+            chapters = self._split_into_chapters(raw)
 
-        if playlist_info:
-            playlist_title = playlist_info.get("title") or playlist_info.get("playlist_title")
-            playlist_description = playlist_info.get("description") or playlist_info.get("playlist_description")
+        bases = []
+        for chap in chapters:
+            try:
+                if self.config.get("normalize_title"):
+                    parsed_artist, parsed_title = self._normalize_title(chap["title"])
+                    if not parsed_artist:
+                        parsed_artist = raw.get("uploader", "") or ""
+                else:
+                    parsed_artist = raw.get("uploader", "") or ""
+                    parsed_title = chap["title"]
+
+                bases.append((chap, {
+                    "title": parsed_title,
+                    "artist": parsed_artist,
+                    "duration_sec": raw.get("duration"),
+                    "isrc": raw.get("isrc"),
+                    "note": "",
+                }))
+            except Exception as e:
+                failed_tracks += 1
+                LOG.error(f"Failed to process chapter '{chap.get('title', 'Unknown')}': {e}")
+                print(f"\n[DABHound] Skipping track due to error: {e}")
+                continue
 
-        if not raw_entries:
-            print("[DABHound] No tracks could be extracted from YouTube URL")
-            return {"tracks": [], "playlist_title": playlist_title, "playlist_description": playlist_description}
-  
-        all_tracks: List[Dict] = []
+        prefetched = self._prefetch_metadata([b for _, b in bases])
+        for (chap, base), mb in zip(bases, prefetched):
+            try:
+                base = self._enrich_metadata(base, mb)
+                track_obj = self._build_track_object(base, raw, chap)
+                track_obj["confidence"] = self._score_track(track_obj)
+                track_obj["_provenance"] = {
+                    "raw_id": raw.get("id"),
+                    "chapter_title": chap.get("title"),
+                    "enrichment_source": base.get("enrichment_source"),
+                }
+
+                tracks.append(track_obj)
+            except Exception as e:
+                failed_tracks += 1
+                LOG.error(f"Failed to process chapter '{chap.get('title', 'Unknown')}': {e}")
+                print(f"\n[DABHound] Skipping track due to error: {e}")
+                continue
+
+        return tracks, failed_tracks
+
+    def _iter_tracks(self, entries: List[Optional[Dict]]) -> Iterator[Dict]:
         failed_tracks = 0
+        produced = 0
 
-        for raw in raw_entries:
+        for raw in self._iter_raw_entries(entries):
             try:
-                chapters = [{"title": raw["title"], "start_sec": 0}]
-                if self.config.get("split_chapters"):
-                    chapters = self._split_into_chapters(raw)
-
-                for chap in chapters:
-                    try:
-                        if self.config.get("normalize_title"):
-                            parsed_artist, parsed_title = self._normalize_title(chap["title"])
-                            if not parsed_artist:
-                                parsed_artist = raw.get("uploader", "") or ""
-                        else:
-                            parsed_artist = raw.get("uploader", "") or ""
-                            parsed_title = chap["title"]
-
-                        base = {
-                            "title": parsed_title,
-                            "artist": parsed_artist,
-                            "duration_sec": raw.get("duration"),
-                            "isrc": raw.get("isrc"),
-                            "note": "",
-                        }
-
-                        base = self._enrich_metadata(base)
-                        track_obj = self._build_track_object(base, raw, chap)
-                        track_obj["confidence"] = self._score_track(track_obj)
-                        track_obj["_provenance"] = {
-                            "raw_id": raw.get("id"),
-                            "chapter_title": chap.get("title"),
-                            "enrichment_source": base.get("enrichment_source"),
-                        }
-
-                        all_tracks.append(track_obj)
-                    except Exception as e:
-                        failed_tracks += 1
-                        LOG.error(f"Failed to process chapter '{chap.get('title', 'Unknown')}': {e}")
-                        print(f"\n[DABHound] Skipping track due to error: {e}")
-                        continue
+                tracks, failed = self._tracks_from_raw(raw)
+                failed_tracks += failed
             except Exception as e:
                 failed_tracks += 1
                 LOG.error(f"Failed to process video '{raw.get('title', 'Unknown')}': {e}")
                 print(f"\n[DABHound] Skipping video due to error: {e}")
                 continue
+            produced += len(tracks)
+            yield from tracks
 
         if failed_tracks > 0:
             print(f"[DABHound] Warning: {failed_tracks} track(s) failed processing and were skipped")
+        if not produced:
+            print("[DABHound] No tracks could be extracted from YouTube URL")
+
+    def stream(self, url: str, known_ids: Optional[Set[str]] = None) -> Dict:
+        """Like parse(), but "tracks" is an iterator that extracts videos lazily.
+
+        Only the flat playlist listing happens up front; each video is fully
+        extracted, split and enriched when the consumer reaches it. Videos
+        whose ID is in ``known_ids`` (already synced) are dropped right after
+        the listing, so they are never extracted or enriched again.
+        """
+        entries, playlist_info = self._list_entries(url)
+        video_count = len(entries)
+
+        known_count = 0
+        if known_ids:
+            entries = [e for e in entries if not (e and e.get("id") in known_ids)]
+            known_count = video_count - len(entries)
+
+        playlist_title = None
+        playlist_description = None
+
+        if playlist_info:
+            playlist_title = playlist_info.get("title") or playlist_info.get("playlist_title")
+            playlist_description = playlist_info.get("description") or playlist_info.get("playlist_description")
 
         return {
-            "tracks": all_tracks,
+            "tracks": self._iter_tracks(entries),
             "playlist_title": playlist_title,
             "playlist_description": playlist_description,
+            "video_count": video_count,
+            "known_count": known_count,
         }
 
+    def parse(self, url: str) -> Dict:
+        data = self.stream(url)
+        data["tracks"] = list(data["tracks"])
+        return data
+
 
 # small self-test when run directly
 if __name__ == "__main__":